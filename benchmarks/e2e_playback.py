@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+End-to-end playback benchmark with local stand-ins for YouTube, Spotify and Discord voice
+
+Drives MusicCog._play_music and MusicPlayer for many guilds at once. Each
+guild plays a search result, a Spotify playlist, a YouTube playlist and a
+video URL, then skips through part of its queue. All network and voice
+work is faked locally with configurable latencies (see benchmarks/fakes.py).
+
+Reports time-to-first-audio, the gap between tracks, event-loop lag, CPU
+time and RSS, and writes them as JSON so runs can be compared across
+commits with --baseline.
+
+Usage: python benchmarks/e2e_playback.py [--guilds N] [--same-links] [--json PATH] [--baseline PATH]
+"""
+
+import os
+import sys
+
+# Keep the run self-contained: memory-only caches, no credentials, no metrics server
+os.environ.update({
+    'DISCORD_TOKEN': 'benchmark',
+    'CLIENT_ID': '0',
+    'YOUTUBE_API_KEY': '',
+    'SPOTIFY_CLIENT_ID': '',
+    'SPOTIFY_CLIENT_SECRET': '',
+    'CACHE_PATH': '',
+    'QUEUE_STORE_PATH': '',
+    'METRICS_PORT': '0',
+    'EXTRACTION_BACKEND': 'thread'
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from types import SimpleNamespace
+
+from benchmarks import fakes
+from src.commands.music import MusicCog
+from src.services import music_player
+from src.services.search_backends import DataApiSearchBackend
+from src.utils.logger import setup_logger
+from src.utils.single_flight import single_flight_stats
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize_ms(values):
+    """p50/p95/max of a list of durations in seconds, reported in milliseconds"""
+    if not values:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+    return {
+        'count': len(values),
+        'p50_ms': statistics.median(values) * 1000,
+        'p95_ms': percentile(values, 0.95) * 1000,
+        'max_ms': max(values) * 1000
+    }
+
+def rss_mib():
+    """Current resident set size, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_mib():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def sample_loop_lag(samples, interval=0.05):
+    """Record how late the event loop wakes up from a fixed sleep"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+def build_cog(args):
+    """Create a MusicCog whose services talk to the local fakes"""
+    cog = MusicCog(SimpleNamespace(user=SimpleNamespace(id=0), cluster=None))
+
+    youtube = cog.youtube_service
+    youtube.youtube = fakes.FakeYouTubeApi(args.api_latency, args.playlist_size)
+    youtube.api_enabled = True
+    youtube.search_backend = DataApiSearchBackend(youtube.youtube)
+    youtube.ytdl = fakes.FakeYoutubeDL(args.extract_latency)
+
+    spotify = cog.spotify_service
+    spotify.spotify = fakes.FakeSpotify(args.api_latency, args.playlist_size)
+    spotify.enabled = True
+
+    # Tracks are short synthetic Opus sources instead of ffmpeg processes
+    async def create_audio_source(stream, start=0):
+        return fakes.FakeAudioSource(args.track_seconds - start)
+    music_player.create_audio_source = create_audio_source
+
+    return cog
+
+async def run_guild(cog, guild_id, recorder, args, rng):
+    """One guild's session: queue a mix of sources, then skip through part of it"""
+    guild = fakes.FakeGuild(guild_id)
+    ctx = fakes.FakeContext(guild, fakes.FakeVoiceChannel(guild, recorder))
+
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    requested_at = time.perf_counter()
+
+    # With --same-links every guild pastes the same queries, like a link going viral
+    source = 0 if args.same_links else guild_id
+    queries = [
+        f"benchmark song {source}",
+        f"https://open.spotify.com/playlist/{fakes.spotify_id('sp', source)}",
+        f"https://www.youtube.com/playlist?list=PL{fakes.fake_id('yt', source, length=16)}",
+        fakes.video_url(fakes.fake_id('video', source))
+    ]
+    for query in queries:
+        await cog._play_music(ctx, query)
+
+    player = cog.get_player(guild)
+    for _ in range(args.skips):
+        await asyncio.sleep(rng.uniform(0.3, 0.8) * args.track_seconds)
+        player.skip(guild_id)
+
+    # Let the remaining tracks play until the guild has heard enough of them
+    deadline = time.perf_counter() + args.timeout
+    while recorder.tracks.get(guild_id, 0) < args.tracks_per_guild and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+
+    first_audio = recorder.first_audio.get(guild_id)
+    voice_client = player.voice_clients.get(guild_id)
+    await player.leave(guild_id)
+    # Let the frame thread deliver its last after callback while the loop is still running
+    if voice_client and voice_client.thread:
+        await asyncio.to_thread(voice_client.thread.join)
+    return first_audio - requested_at if first_audio else None
+
+async def run(args):
+    rng = random.Random(args.seed)
+    recorder = fakes.PlaybackRecorder()
+    cog = build_cog(args)
+
+    lag_samples = []
+    sampler = asyncio.create_task(sample_loop_lag(lag_samples))
+
+    rss_before = rss_mib()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    ttfa = await asyncio.gather(*[
+        run_guild(cog, 1000 + index, recorder, args, rng) for index in range(args.guilds)
+    ])
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    sampler.cancel()
+
+    ttfa = [value for value in ttfa if value is not None]
+    return {
+        'time_to_first_audio': summarize_ms(ttfa),
+        'inter_track_gap': summarize_ms(recorder.gaps),
+        'loop_lag': summarize_ms(lag_samples),
+        'tracks_started': sum(recorder.tracks.values()),
+        'frames_consumed': recorder.frames,
+        'guilds_without_audio': args.guilds - len(ttfa),
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'cpu_percent': cpu / wall * 100 if wall else None,
+        'rss_mib': rss_mib(),
+        'rss_growth_mib': (rss_mib() - rss_before) if rss_before is not None else None,
+        'peak_rss_mib': peak_rss_mib(),
+        'coalesced': {
+            name: stats['joined'] for name, stats in sorted(single_flight_stats().items())
+        },
+        'fake_calls': {
+            'youtube_api': cog.youtube_service.youtube.counter['calls'],
+            'spotify_api': cog.spotify_service.spotify.counter['calls'],
+            'ytdlp_extract': cog.youtube_service.ytdl.counter['calls']
+        }
+    }
+
+# Metrics compared against a baseline, and whether lower is better
+COMPARED = [
+    ('time_to_first_audio', 'p50_ms'),
+    ('time_to_first_audio', 'p95_ms'),
+    ('inter_track_gap', 'p50_ms'),
+    ('inter_track_gap', 'p95_ms'),
+    ('loop_lag', 'p95_ms'),
+    ('loop_lag', 'max_ms'),
+    ('cpu_seconds', None),
+    ('peak_rss_mib', None),
+]
+
+def lookup(results, key, field):
+    value = results.get(key)
+    return value.get(field) if field and isinstance(value, dict) else value
+
+def print_report(results, baseline=None):
+    print(f"{'metric':<28} {'current':>10}" + (f" {'baseline':>10} {'change':>8}" if baseline else ''))
+    for key, field in COMPARED:
+        name = f"{key}.{field}" if field else key
+        current = lookup(results, key, field)
+        line = f"{name:<28} {current:>10.1f}" if current is not None else f"{name:<28} {'-':>10}"
+        if baseline:
+            previous = lookup(baseline, key, field)
+            if previous is not None and current is not None:
+                change = f"{(current - previous) / previous:+.0%}" if previous else '-'
+                line += f" {previous:>10.1f} {change:>8}"
+        print(line)
+    print(f"\n{results['tracks_started']} tracks started, "
+          f"{results['guilds_without_audio']} guilds without audio, "
+          f"fake calls: {results['fake_calls']}, coalesced: {results['coalesced']}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--guilds', type=int, default=10)
+    parser.add_argument('--playlist-size', type=int, default=50)
+    parser.add_argument('--track-seconds', type=float, default=2.0,
+                        help="Length of each synthetic track")
+    parser.add_argument('--tracks-per-guild', type=int, default=6)
+    parser.add_argument('--skips', type=int, default=2)
+    parser.add_argument('--api-latency', type=float, default=0.08)
+    parser.add_argument('--extract-latency', type=float, default=0.6)
+    parser.add_argument('--ramp', type=float, default=1.0,
+                        help="Spread guild start times over this many seconds")
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--same-links', action='store_true',
+                        help="Have every guild paste the same song, playlists and video")
+    parser.add_argument('--json', help="Write the results to this file")
+    parser.add_argument('--baseline', help="Compare against a previous --json file")
+    parser.add_argument('--verbose', action='store_true', help="Show the bot's log output")
+    args = parser.parse_args()
+
+    if args.verbose:
+        setup_logger()
+
+    results = await run(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)['results']
+    print_report(results, baseline)
+
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'parameters': vars(args),
+            'results': results
+        }
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,356 @@
+"""
+Local stand-ins for YouTube, Spotify, yt-dlp and Discord voice used by the benchmarks
+
+Every fake sleeps for a configurable latency in the calling thread, the way
+the real blocking clients do, and returns deterministic data derived from
+its inputs so runs are repeatable.
+"""
+
+import asyncio
+import base64
+import hashlib
+import threading
+import time
+from types import SimpleNamespace
+
+# discord.py sends one 20ms Opus frame per tick
+FRAME_SECONDS = 0.02
+
+def fake_id(*parts, length=11):
+    """Deterministic YouTube/Spotify-style ID for a set of inputs"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).digest()
+    return base64.urlsafe_b64encode(digest).decode()[:length]
+
+def spotify_id(*parts):
+    """Deterministic base62 Spotify ID for a set of inputs"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:22]
+
+def video_url(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+def iso_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"PT{minutes}M{seconds}S"
+
+def video_duration(video_id):
+    return 120 + sum(video_id.encode()) % 240
+
+class FakeRequest:
+    """googleapiclient HttpRequest stand-in"""
+
+    def __init__(self, latency, response, counter):
+        self.latency = latency
+        self.response = response
+        self.counter = counter
+
+    def execute(self):
+        time.sleep(self.latency)
+        self.counter['calls'] += 1
+        return self.response
+
+class FakeResource:
+    def __init__(self, api, handler):
+        self.api = api
+        self.handler = handler
+
+    def list(self, **params):
+        return FakeRequest(self.api.latency, self.handler(**params), self.api.counter)
+
+class FakeYouTubeApi:
+    """YouTube Data API v3 client covering search, videos, playlists and playlistItems"""
+
+    def __init__(self, latency=0.08, playlist_size=50):
+        self.latency = latency
+        self.playlist_size = playlist_size
+        self.counter = {'calls': 0}
+
+    def _search(self, q, maxResults=5, **_):
+        return {'items': [
+            {
+                'id': {'videoId': fake_id('search', q, rank)},
+                'snippet': {
+                    'title': f"{q} (result {rank + 1})",
+                    'channelTitle': f"Channel {rank}",
+                    'thumbnails': {'default': {'url': 'https://i.ytimg.com/default.jpg'}}
+                }
+            }
+            for rank in range(maxResults)
+        ]}
+
+    def _videos(self, id, **_):
+        return {'items': [
+            {'id': video_id, 'contentDetails': {'duration': iso_duration(video_duration(video_id))}}
+            for video_id in id.split(',')
+        ]}
+
+    def _playlists(self, id, **_):
+        return {'items': [{'snippet': {'title': f"Playlist {id}"}}]}
+
+    def _playlist_items(self, playlistId, maxResults=50, pageToken=None, **_):
+        start = int(pageToken or 0)
+        stop = min(start + maxResults, self.playlist_size)
+        response = {'items': [
+            {'snippet': {
+                'title': f"{playlistId} video {index}",
+                'channelTitle': 'Uploader',
+                'resourceId': {'videoId': fake_id(playlistId, index)},
+                'thumbnails': {'default': {'url': 'https://i.ytimg.com/default.jpg'}}
+            }}
+            for index in range(start, stop)
+        ]}
+        if stop < self.playlist_size:
+            response['nextPageToken'] = str(stop)
+        return response
+
+    def search(self):
+        return FakeResource(self, self._search)
+
+    def videos(self):
+        return FakeResource(self, self._videos)
+
+    def playlists(self):
+        return FakeResource(self, self._playlists)
+
+    def playlistItems(self):
+        return FakeResource(self, self._playlist_items)
+
+class FakeSpotify:
+    """spotipy.Spotify stand-in for playlists, albums, tracks and artist top tracks"""
+
+    def __init__(self, latency=0.1, playlist_size=50):
+        self.latency = latency
+        self.playlist_size = playlist_size
+        self.counter = {'calls': 0}
+
+    def _request(self):
+        time.sleep(self.latency)
+        self.counter['calls'] += 1
+
+    def _track(self, track_id, name=None, artist_id=None):
+        index = int(track_id, 16) % 7 if track_id else 0
+        return {
+            'id': track_id,
+            'name': name or f"Song {track_id}",
+            'duration_ms': 180000 + index * 1000,
+            'artists': [{'id': artist_id or spotify_id('artist', index), 'name': f"Artist {index}"}]
+        }
+
+    def _items(self, playlist_id, offset, limit):
+        return [
+            {'track': self._track(
+                spotify_id('spotify', playlist_id, index), f"Song {index} of {playlist_id}"
+            )}
+            for index in range(offset, min(offset + limit, self.playlist_size))
+        ]
+
+    def _album_tracks(self, album_id, offset, limit):
+        return [
+            self._track(spotify_id('album', album_id, index), f"Song {index} of {album_id}")
+            for index in range(offset, min(offset + limit, self.playlist_size))
+        ]
+
+    def playlist(self, playlist_id, fields=None, **_):
+        self._request()
+        return {
+            'name': f"Spotify {playlist_id}",
+            'tracks': {'total': self.playlist_size, 'items': self._items(playlist_id, 0, 100)}
+        }
+
+    def playlist_items(self, playlist_id, fields=None, limit=100, offset=0, **_):
+        self._request()
+        return {'items': self._items(playlist_id, offset, limit)}
+
+    def tracks(self, tracks, market=None):
+        self._request()
+        return {'tracks': [self._track(track_id) for track_id in tracks]}
+
+    def albums(self, albums, market=None):
+        self._request()
+        return {'albums': [
+            {
+                'id': album_id,
+                'name': f"Album {album_id}",
+                'tracks': {'total': self.playlist_size, 'items': self._album_tracks(album_id, 0, 50)}
+            }
+            for album_id in albums
+        ]}
+
+    def album_tracks(self, album_id, limit=50, offset=0, market=None):
+        self._request()
+        return {'items': self._album_tracks(album_id, offset, limit)}
+
+    def artist_top_tracks(self, artist_id, country='US'):
+        self._request()
+        return {'tracks': [
+            self._track(spotify_id('top', artist_id, index), artist_id=artist_id) for index in range(10)
+        ]}
+
+class FakeYoutubeDL:
+    """yt_dlp.YoutubeDL stand-in whose extract_info returns an Opus stream"""
+
+    def __init__(self, latency=0.6):
+        self.latency = latency
+        self.counter = {'calls': 0}
+
+    def extract_info(self, url, download=False):
+        time.sleep(self.latency)
+        self.counter['calls'] += 1
+        video_id = url.rsplit('=', 1)[-1]
+        expires = int(time.time()) + 6 * 3600
+        return {
+            'id': video_id,
+            'title': f"Video {video_id}",
+            'duration': video_duration(video_id),
+            'thumbnail': 'https://i.ytimg.com/default.jpg',
+            'uploader': 'Uploader',
+            'url': f"https://rr1.googlevideo.com/videoplayback?id={video_id}&expire={expires}",
+            'acodec': 'opus'
+        }
+
+class FakeAudioSource:
+    """Opus audio source producing a fixed number of 20ms frames"""
+
+    def __init__(self, seconds):
+        self.frames = max(1, int(seconds / FRAME_SECONDS))
+
+    def read(self):
+        if self.frames <= 0:
+            return b''
+        self.frames -= 1
+        return b'\xf8\xff\xfe'
+
+    def is_opus(self):
+        return True
+
+    def cleanup(self):
+        self.frames = 0
+
+class PlaybackRecorder:
+    """Collects playback timestamps from every fake voice client"""
+
+    def __init__(self):
+        self.first_audio = {}
+        self.gaps = []
+        self.tracks = {}
+        self.last_end = {}
+        self.frames = 0
+        self.lock = threading.Lock()
+
+    def started(self, guild_id):
+        now = time.perf_counter()
+        with self.lock:
+            self.first_audio.setdefault(guild_id, now)
+            self.tracks[guild_id] = self.tracks.get(guild_id, 0) + 1
+            last_end = self.last_end.pop(guild_id, None)
+            if last_end is not None:
+                self.gaps.append(now - last_end)
+
+    def finished(self, guild_id):
+        with self.lock:
+            self.last_end[guild_id] = time.perf_counter()
+
+    def consumed(self):
+        with self.lock:
+            self.frames += 1
+
+class FakeVoiceClient:
+    """discord.VoiceClient stand-in that consumes audio frames in real time on its own thread"""
+
+    def __init__(self, channel, recorder):
+        self.channel = channel
+        self.guild = channel.guild
+        self.recorder = recorder
+        self.connected = True
+        self.source = None
+        self.stopped = threading.Event()
+        self.resumed = threading.Event()
+        self.thread = None
+
+    def _run(self, source, after):
+        self.recorder.started(self.guild.id)
+        next_frame = time.perf_counter()
+        while not self.stopped.is_set():
+            self.resumed.wait()
+            if not source.read():
+                break
+            self.recorder.consumed()
+            next_frame += FRAME_SECONDS
+            time.sleep(max(0, next_frame - time.perf_counter()))
+        source.cleanup()
+        self.source = None
+        self.recorder.finished(self.guild.id)
+        after(None)
+
+    def play(self, source, after=None):
+        if self.source is not None:
+            raise RuntimeError("Already playing audio.")
+        self.source = source
+        self.stopped = threading.Event()
+        self.resumed.set()
+        self.thread = threading.Thread(
+            target=self._run, args=(source, after or (lambda error: None)), daemon=True
+        )
+        self.thread.start()
+
+    def is_playing(self):
+        return self.source is not None and self.resumed.is_set()
+
+    def is_paused(self):
+        return self.source is not None and not self.resumed.is_set()
+
+    def is_connected(self):
+        return self.connected
+
+    def pause(self):
+        self.resumed.clear()
+
+    def resume(self):
+        self.resumed.set()
+
+    def stop(self):
+        self.stopped.set()
+        self.resumed.set()
+
+    async def move_to(self, channel):
+        self.channel = channel
+
+    async def disconnect(self, force=False):
+        self.stop()
+        self.connected = False
+
+class FakeVoiceChannel:
+    def __init__(self, guild, recorder):
+        self.guild = guild
+        self.id = guild.id * 10
+        self.recorder = recorder
+        self.members = [SimpleNamespace(id=guild.id, bot=False)]
+
+    async def connect(self):
+        await asyncio.sleep(0.05)
+        return FakeVoiceClient(self, self.recorder)
+
+class FakeGuild:
+    def __init__(self, guild_id, shard_id=0):
+        self.id = guild_id
+        self.shard_id = shard_id
+
+    def get_member(self, member_id):
+        return None
+
+    def get_channel(self, channel_id):
+        return None
+
+class FakeMessage:
+    async def edit(self, content=None, embed=None):
+        pass
+
+class FakeContext:
+    """commands.Context stand-in for a member sitting in a voice channel"""
+
+    def __init__(self, guild, channel):
+        self.guild = guild
+        self.author = SimpleNamespace(id=guild.id, voice=SimpleNamespace(channel=channel))
+        self.prefix = '!'
+
+    async def send(self, content=None, embed=None):
+        return FakeMessage()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Search backend benchmark: YouTube Data API vs yt-dlp ytsearch
+
+Runs the same queries through every available backend (bypassing the
+metadata cache) and reports latency and how closely the results agree.
+The Data API backend is only included when YOUTUBE_API_KEY is set; each
+query costs it 100 quota units.
+
+Usage: python benchmarks/search_backends.py [--results N] [--json PATH] [query ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import config
+from src.services.search_backends import DataApiSearchBackend, YtDlpSearchBackend
+
+DEFAULT_QUERIES = [
+    "never gonna give you up",
+    "bohemian rhapsody queen",
+    "lofi hip hop",
+    "daft punk get lucky",
+    "taylor swift anti-hero",
+    "beethoven moonlight sonata",
+    "blinding lights the weeknd",
+    "nirvana smells like teen spirit",
+]
+
+def video_ids(results):
+    return [result['url'].rsplit('=', 1)[-1] for result in results]
+
+async def run_backend(backend, queries, max_results):
+    """Run every query through a backend and record latency and result IDs"""
+    runs = []
+    for query in queries:
+        start = time.perf_counter()
+        try:
+            results = await backend.search(query, max_results)
+            error = None
+        except Exception as exc:
+            results, error = [], str(exc)
+        runs.append({
+            'query': query,
+            'latency_ms': (time.perf_counter() - start) * 1000,
+            'ids': video_ids(results),
+            'error': error
+        })
+    return runs
+
+def summarize(runs):
+    latencies = [run['latency_ms'] for run in runs if not run['error']]
+    return {
+        'queries': len(runs),
+        'errors': sum(1 for run in runs if run['error']),
+        'p50_ms': statistics.median(latencies) if latencies else None,
+        'max_ms': max(latencies) if latencies else None,
+    }
+
+def agreement(reference, candidate):
+    """Top-1 agreement and mean top-k overlap between two backends"""
+    top1 = []
+    overlap = []
+    for ref, other in zip(reference, candidate):
+        if ref['error'] or other['error'] or not ref['ids']:
+            continue
+        top1.append(bool(other['ids']) and ref['ids'][0] == other['ids'][0])
+        overlap.append(len(set(ref['ids']) & set(other['ids'])) / len(ref['ids']))
+    if not top1:
+        return None
+    return {
+        'top1_match': sum(top1) / len(top1),
+        'topk_overlap': sum(overlap) / len(overlap),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('queries', nargs='*', default=DEFAULT_QUERIES)
+    parser.add_argument('--results', type=int, default=5)
+    parser.add_argument('--json', help="Write the full report to this file")
+    args = parser.parse_args()
+
+    backends = [YtDlpSearchBackend()]
+    if config.YOUTUBE_API_KEY:
+        from googleapiclient.discovery import build
+        youtube = build('youtube', 'v3', developerKey=config.YOUTUBE_API_KEY)
+        backends.insert(0, DataApiSearchBackend(youtube))
+
+    report = {'queries': args.queries, 'backends': {}}
+    for backend in backends:
+        runs = await run_backend(backend, args.queries, args.results)
+        report['backends'][backend.name] = {'summary': summarize(runs), 'runs': runs}
+
+    print(f"{'backend':<8} {'p50 ms':>8} {'max ms':>8} {'errors':>7}")
+    for name, data in report['backends'].items():
+        summary = data['summary']
+        p50 = f"{summary['p50_ms']:.0f}" if summary['p50_ms'] is not None else '-'
+        worst = f"{summary['max_ms']:.0f}" if summary['max_ms'] is not None else '-'
+        print(f"{name:<8} {p50:>8} {worst:>8} {summary['errors']:>7}")
+
+    if 'api' in report['backends']:
+        quality = agreement(
+            report['backends']['api']['runs'], report['backends']['ytdlp']['runs']
+        )
+        report['agreement'] = quality
+        if quality:
+            print(f"\nytdlp vs api: top-1 match {quality['top1_match']:.0%}, "
+                  f"top-{args.results} overlap {quality['topk_overlap']:.0%}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
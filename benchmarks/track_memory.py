@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: dict queue items vs compact Track objects
+
+Builds a 10k-track queue both ways and reports the memory retained by each.
+
+Usage: python benchmarks/track_memory.py [track_count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.track import Track
+
+CHANNEL_COUNT = 200
+
+class FakeMember:
+    """Stand-in for a discord.Member with a realistic attribute footprint"""
+
+    def __init__(self, member_id):
+        self.id = member_id
+        self.name = f"user{member_id}"
+        self.display_name = f"User {member_id}"
+        self.roles = list(range(10))
+
+def make_results(count):
+    """Build service results as the YouTube playlist fetcher used to return them"""
+    return [
+        {
+            'title': f"Song number {i}",
+            'url': f"https://www.youtube.com/watch?v={i:011d}",
+            'thumbnail': f"https://i.ytimg.com/vi/{i:011d}/default.jpg",
+            # Channel names arrive as fresh strings in every API response
+            'author': f"Channel {i % CHANNEL_COUNT}",
+            'description': f"Official video {i}. " + "Lyrics, credits and links. " * 20,
+            'duration': 200 + i % 100
+        }
+        for i in range(count)
+    ]
+
+def build_dict_queue(results, member):
+    return [
+        {**track, 'requested_by': member, 'added_at': 0.0, 'is_playlist': True}
+        for track in results
+    ]
+
+def build_track_queue(results, member):
+    return [
+        Track.from_dict(track, requested_by=member.id, added_at=0.0, is_playlist=True)
+        for track in results
+    ]
+
+def measure(builder, count):
+    """Measure memory retained by a queue once the source results are released"""
+    member = FakeMember(1234)
+    tracemalloc.start()
+    results = make_results(count)
+    queue = builder(results, member)
+    del results
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return current
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    dict_bytes = measure(build_dict_queue, count)
+    track_bytes = measure(build_track_queue, count)
+
+    print(f"Queue of {count} tracks")
+    print(f"  dict items:  {dict_bytes / 1024 / 1024:8.2f} MiB ({dict_bytes / count:7.0f} B/track)")
+    print(f"  Track items: {track_bytes / 1024 / 1024:8.2f} MiB ({track_bytes / count:7.0f} B/track)")
+    print(f"  saved:       {(1 - track_bytes / dict_bytes) * 100:8.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: play query classification with per-call regexes vs the URL router
+
+Times classifying and extracting IDs from a mixed batch of queries the way
+_play_music used to (substring checks plus `import re` and re.search on every
+call) and with url_router.route_url, both uncached and through its LRU cache.
+Uncached, the router is slower than the old regexes (measured 4.76 vs 3.20 µs
+per query, about 0.7x); it is only faster for repeated queries served from its
+LRU cache (around 0.1 µs). Correctness is covered by tests/test_url_router.py.
+
+Usage: python benchmarks/url_router.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.url_router import route_url
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+PLAYLIST_ID = 'PLFgquLnL59alCl_2TQvOiD5Vgm1hCaGSI'
+SPOTIFY_ID = '37i9dQZF1DXcBWIGoYBM5M'
+
+# A mix of the query shapes users paste (tests/test_url_router.py checks the results)
+QUERIES = [
+    f"https://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://youtube.com/watch?v={VIDEO_ID}&t=42s",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&list={PLAYLIST_ID}",
+    f"https://music.youtube.com/watch?v={VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}?si=abc123",
+    f"https://www.youtube.com/embed/{VIDEO_ID}",
+    f"https://www.youtube.com/shorts/{VIDEO_ID}",
+    f"https://www.youtube.com/playlist?list={PLAYLIST_ID}",
+    f"https://music.youtube.com/playlist?list={PLAYLIST_ID}",
+    f"https://open.spotify.com/playlist/{SPOTIFY_ID}?si=0123abcd",
+    f"https://open.spotify.com/intl-de/playlist/{SPOTIFY_ID}",
+    f"https://open.spotify.com/album/{SPOTIFY_ID}",
+    f"https://open.spotify.com/track/{SPOTIFY_ID}?si=x",
+    "https://soundcloud.com/artist/song",
+    "never gonna give you up",
+    "despacito",
+]
+
+def legacy_extract_video_id(url):
+    """YouTubeService.extract_video_id before the router"""
+    import re
+    patterns = [
+        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
+        r'youtube\.com\/v\/([a-zA-Z0-9_-]{11})',
+        r'music\.youtube\.com\/watch\?v=([a-zA-Z0-9_-]{11})'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+def legacy_extract_playlist_id(url):
+    import re
+    match = re.search(r'[?&]list=([a-zA-Z0-9_-]+)', url)
+    return match.group(1) if match else None
+
+def legacy_extract_spotify_id(url):
+    import re
+    match = re.search(r'playlist/([a-zA-Z0-9]+)', url)
+    return match.group(1) if match else None
+
+def legacy_route(query):
+    """The checks _play_music ran in sequence before the router"""
+    if 'spotify.com/playlist/' in query or 'open.spotify.com/playlist/' in query:
+        return 'spotify_playlist', legacy_extract_spotify_id(query)
+    if 'youtube.com/playlist' in query or 'music.youtube.com/playlist' in query:
+        return 'playlist', legacy_extract_playlist_id(query)
+    video_id = legacy_extract_video_id(query)
+    if video_id is not None:
+        return 'video', video_id
+    if urlparse(query.strip()).scheme in ('http', 'https'):
+        return 'url', None
+    return 'search', None
+
+def bench(label, function, queries, iterations):
+    seconds = timeit.timeit(lambda: [function(query) for query in queries], number=iterations)
+    per_call = seconds / (iterations * len(queries)) * 1e6
+    print(f"{label:<28} {per_call:>8.2f} µs/query")
+    return per_call
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    legacy = bench("legacy per-call regex", legacy_route, QUERIES, iterations)
+    cold = bench("router (uncached)", route_url.__wrapped__, QUERIES, iterations)
+    cached = bench("router (LRU cached)", route_url, QUERIES, iterations)
+    print(f"\nuncached {legacy / cold:.1f}x, cached {legacy / cached:.1f}x relative to legacy")
+    print(f"router cache: {route_url.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,15 @@ Discord Music Bot - Main Entry Point
 import asyncio
 import logging
 import os
-from src.bot import DiscordMusicBot
-from src.utils.logger import setup_logger
+
+# The bot is imported inside the entry points rather than here: spawned yt-dlp
+# workers re-import this module and should only load the extraction helpers
 
 async def main():
     """Main function to start the Discord Music Bot"""
+    from src.bot import DiscordMusicBot
+    from src.utils.logger import setup_logger
+    
     try:
         # Setup logging
         setup_logger()
@@ -25,4 +29,12 @@ async def main():
         exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    from src.cluster import run_cluster
+    from src.config import config
+    from src.utils.logger import setup_logger
+    
+    if config.CLUSTER_PROCESSES > 1:
+        setup_logger(prefix="supervisor")
+        run_cluster()
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -7,14 +7,17 @@ from discord.ext import commands
 import logging
 from src.config import config, validate_config
 from src.commands.music import MusicCog
+from src.services.executors import extraction_pool
+from src.utils.loop_monitor import loop_monitor
+from src.utils.metrics import MetricsServer
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-class DiscordMusicBot(commands.Bot):
+class DiscordMusicBot(commands.AutoShardedBot):
     """Main Discord Music Bot class"""
     
-    def __init__(self):
+    def __init__(self, cluster=None):
         # Validate configuration
         validate_config()
         
@@ -27,9 +30,15 @@ class DiscordMusicBot(commands.Bot):
         super().__init__(
             command_prefix=config.PREFIX,
             intents=intents,
-            help_command=None
+            help_command=None,
+            shard_count=config.SHARD_COUNT,
+            shard_ids=config.SHARD_IDS
         )
         
+        # Supervisor connection when running as one process of a cluster
+        self.cluster = cluster
+        self.metrics_server = None
+        
         # Setup event handlers
         self.setup_events()
     
@@ -48,13 +57,20 @@ class DiscordMusicBot(commands.Bot):
             )
             await self.change_presence(activity=activity)
             
-            # Sync slash commands
+            # Slash commands are global, so only the first cluster syncs them
+            if self.cluster and self.cluster.cluster_id != 0:
+                return
             try:
                 synced = await self.tree.sync()
                 logger.info(f"✅ Synced {len(synced)} slash commands")
             except Exception as e:
                 logger.error(f"Failed to sync slash commands: {e}")
         
+        @self.event
+        async def on_shard_ready(shard_id):
+            guilds = sum(1 for guild in self.guilds if guild.shard_id == shard_id)
+            logger.info(f"🔀 Shard {shard_id} ready with {guilds} guilds")
+        
         @self.event
         async def on_command_error(ctx, error):
             """Handle command errors"""
@@ -78,10 +94,53 @@ class DiscordMusicBot(commands.Bot):
     
     async def setup_hook(self):
         """Setup hook called when bot is starting"""
+        # Warm up yt-dlp worker processes when the process backend is enabled
+        extraction_pool.start()
+        
+        if config.LOOP_MONITOR:
+            loop_monitor.start()
+        
+        if self.cluster:
+            self.cluster.start(self)
+        
+        if config.METRICS_PORT:
+            port = config.METRICS_PORT + (self.cluster.cluster_id if self.cluster else 0)
+            self.metrics_server = MetricsServer(config.METRICS_HOST, port)
+            try:
+                await self.metrics_server.start()
+            except OSError as error:
+                logger.error(f"Failed to start metrics endpoint: {error}")
+                self.metrics_server = None
+        
         # Add cogs
         await self.add_cog(MusicCog(self))
         logger.info("✅ Music cog loaded")
     
+    def get_shard_stats(self):
+        """Latency, guild count and active voice clients for each shard"""
+        stats = {
+            shard_id: {'latency': shard.latency, 'guilds': 0, 'voice_clients': 0}
+            for shard_id, shard in self.shards.items()
+        }
+        for guild in self.guilds:
+            if guild.shard_id in stats:
+                stats[guild.shard_id]['guilds'] += 1
+        for voice_client in self.voice_clients:
+            shard_id = voice_client.guild.shard_id
+            if shard_id in stats:
+                stats[shard_id]['voice_clients'] += 1
+        return stats
+    
+    def get_cluster_stats(self):
+        """Totals for this process, reported to the cluster supervisor"""
+        shards = self.get_shard_stats()
+        return {
+            'shards': sorted(shards),
+            'guilds': len(self.guilds),
+            'voice_clients': len(self.voice_clients),
+            'latency': max((shard['latency'] for shard in shards.values()), default=0.0)
+        }
+    
     async def start(self):
         """Start the bot"""
         try:
@@ -93,4 +152,7 @@ class DiscordMusicBot(commands.Bot):
     async def close(self):
         """Close the bot gracefully"""
         logger.info("🛑 Shutting down Discord Music Bot...")
-        await super().close()
\ No newline at end of file
+        await super().close()
+        loop_monitor.stop()
+        if self.metrics_server:
+            await self.metrics_server.stop()
\ No newline at end of file
@@ -0,0 +1,277 @@
+"""
+Cluster mode: run shard groups in separate bot processes under one supervisor
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+from src.bot import DiscordMusicBot
+from src.config import config, validate_config
+from src.utils.logger import get_logger, setup_logger
+
+logger = get_logger(__name__)
+
+# Seconds the supervisor waits for every cluster to answer a stats request
+STATS_TIMEOUT = 5.0
+# Restart backoff for crashed clusters (doubles per crash within RESTART_RESET seconds)
+RESTART_DELAY = 5.0
+RESTART_MAX_DELAY = 300.0
+RESTART_RESET = 600.0
+
+def split_shards(shard_count, cluster_count):
+    """Split shard IDs into contiguous, evenly sized ranges"""
+    cluster_count = max(1, min(cluster_count, shard_count))
+    size, extra = divmod(shard_count, cluster_count)
+    ranges = []
+    start = 0
+    for index in range(cluster_count):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append(list(range(start, stop)))
+        start = stop
+    return ranges
+
+async def fetch_recommended_shards(token):
+    """Ask Discord how many shards this bot should run"""
+    from discord.http import HTTPClient, Route
+    http = HTTPClient(None)
+    try:
+        await http.static_login(token)
+        data = await http.request(Route('GET', '/gateway/bot'))
+        return data['shards']
+    finally:
+        await http.close()
+
+class ClusterClient:
+    """Worker-side end of the supervisor pipe"""
+
+    def __init__(self, cluster_id, shard_ids, conn):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.conn = conn
+        self.bot = None
+        self.loop = None
+        self.pending = {}
+        self.nonces = itertools.count()
+
+    def start(self, bot):
+        """Attach to the running bot and start listening for supervisor messages"""
+        self.bot = bot
+        self.loop = asyncio.get_running_loop()
+        threading.Thread(
+            target=self._reader, name=f"cluster-{self.cluster_id}-ipc", daemon=True
+        ).start()
+
+    def _reader(self):
+        # Pipe reads block, so they live on their own thread and hop onto the loop
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                logger.error("Lost connection to the cluster supervisor")
+                self.loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self.bot.close()))
+                return
+            self.loop.call_soon_threadsafe(self._handle, message)
+
+    def _send(self, message):
+        try:
+            self.conn.send(message)
+        except (BrokenPipeError, OSError) as error:
+            logger.warning(f"Could not reach the cluster supervisor: {error}")
+
+    def _handle(self, message):
+        op = message['op']
+        if op == 'collect_stats':
+            self._send({
+                'op': 'stats',
+                'nonce': message['nonce'],
+                'data': self.bot.get_cluster_stats()
+            })
+        elif op == 'reply':
+            future = self.pending.pop(message['nonce'], None)
+            if future and not future.done():
+                future.set_result(message['data'])
+        elif op == 'event':
+            self.bot.dispatch(f"cluster_{message['event']}", message['data'])
+        elif op == 'shutdown':
+            asyncio.ensure_future(self.bot.close())
+
+    async def _request(self, message, timeout):
+        nonce = next(self.nonces)
+        future = self.loop.create_future()
+        self.pending[nonce] = future
+        self._send({**message, 'nonce': nonce})
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(nonce, None)
+
+    async def fetch_stats(self):
+        """Collect stats from every cluster, keyed by cluster ID"""
+        return await self._request({'op': 'stats_request'}, STATS_TIMEOUT + 1)
+
+    def broadcast(self, event, data=None):
+        """Dispatch an event as `on_cluster_<event>` in every cluster, including this one"""
+        self._send({'op': 'broadcast', 'event': event, 'data': data})
+
+def run_cluster_worker(cluster_id, shard_ids, shard_count, conn):
+    """Process entry point for one cluster"""
+    setup_logger(prefix=f"cluster {cluster_id}")
+    config.SHARD_IDS = shard_ids
+    config.SHARD_COUNT = shard_count
+
+    async def main():
+        bot = DiscordMusicBot(cluster=ClusterClient(cluster_id, shard_ids, conn))
+        await bot.start()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+class ClusterSupervisor:
+    """Spawns one bot process per shard group, relays IPC and restarts crashed clusters"""
+
+    def __init__(self, shard_ranges, shard_count):
+        self.shard_ranges = shard_ranges
+        self.shard_count = shard_count
+        self.context = multiprocessing.get_context('spawn')
+        self.workers = {}
+        self.restarts = {}
+        self.pending_restarts = {}
+        self.stats_requests = {}
+        self.running = True
+
+    def _spawn(self, cluster_id):
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=run_cluster_worker,
+            args=(cluster_id, self.shard_ranges[cluster_id], self.shard_count, child_conn),
+            name=f"cluster-{cluster_id}"
+        )
+        process.start()
+        child_conn.close()
+        self.workers[cluster_id] = {'process': process, 'conn': parent_conn, 'started': time.monotonic()}
+        shards = self.shard_ranges[cluster_id]
+        logger.info(f"🧩 Started cluster {cluster_id} (pid {process.pid}) for shards {shards[0]}-{shards[-1]}")
+
+    def _send(self, cluster_id, message):
+        worker = self.workers.get(cluster_id)
+        if not worker:
+            return
+        try:
+            worker['conn'].send(message)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def _handle(self, cluster_id, message):
+        op = message['op']
+        if op == 'stats_request':
+            key = (cluster_id, message['nonce'])
+            self.stats_requests[key] = {
+                'deadline': time.monotonic() + STATS_TIMEOUT,
+                'waiting': set(self.workers),
+                'results': {}
+            }
+            for target in list(self.workers):
+                self._send(target, {'op': 'collect_stats', 'nonce': key})
+        elif op == 'stats':
+            request = self.stats_requests.get(message['nonce'])
+            if request:
+                request['results'][cluster_id] = message['data']
+                request['waiting'].discard(cluster_id)
+        elif op == 'broadcast':
+            for target in list(self.workers):
+                self._send(target, {'op': 'event', 'event': message['event'], 'data': message['data']})
+
+    def _finish_stats_requests(self):
+        # Answer requests once every cluster replied or the deadline passed
+        now = time.monotonic()
+        for key, request in list(self.stats_requests.items()):
+            if request['waiting'] and now < request['deadline']:
+                continue
+            requester, nonce = key
+            self._send(requester, {'op': 'reply', 'nonce': nonce, 'data': request['results']})
+            del self.stats_requests[key]
+
+    def _reap(self, cluster_id):
+        worker = self.workers.pop(cluster_id)
+        worker['process'].join()
+        worker['conn'].close()
+        for request in self.stats_requests.values():
+            request['waiting'].discard(cluster_id)
+
+        if not self.running:
+            return
+
+        # Back off on crash loops, but forget old crashes after a stable run
+        uptime = time.monotonic() - worker['started']
+        delay = self.restarts.get(cluster_id, 0)
+        delay = RESTART_DELAY if uptime > RESTART_RESET or not delay else min(delay * 2, RESTART_MAX_DELAY)
+        self.restarts[cluster_id] = delay
+        logger.error(
+            f"Cluster {cluster_id} exited with code {worker['process'].exitcode}, "
+            f"restarting in {delay:.0f}s"
+        )
+        self.pending_restarts[cluster_id] = time.monotonic() + delay
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for cluster_id, due in list(self.pending_restarts.items()):
+            if now >= due:
+                del self.pending_restarts[cluster_id]
+                self._spawn(cluster_id)
+
+    def stop(self, *_):
+        """Ask every cluster to shut down"""
+        if not self.running:
+            return
+        self.running = False
+        logger.info("🛑 Stopping clusters...")
+        for cluster_id in list(self.workers):
+            self._send(cluster_id, {'op': 'shutdown'})
+
+    def run(self):
+        """Run the supervisor until every cluster has exited after stop()"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        for cluster_id in range(len(self.shard_ranges)):
+            self._spawn(cluster_id)
+
+        while self.workers or (self.running and self.pending_restarts):
+            by_conn = {worker['conn']: cluster_id for cluster_id, worker in self.workers.items()}
+            by_sentinel = {
+                worker['process'].sentinel: cluster_id for cluster_id, worker in self.workers.items()
+            }
+            ready = wait(list(by_conn) + list(by_sentinel), timeout=1.0)
+
+            for handle in ready:
+                if handle in by_conn:
+                    try:
+                        message = handle.recv()
+                    except (EOFError, OSError):
+                        continue
+                    self._handle(by_conn[handle], message)
+
+            for handle in ready:
+                cluster_id = by_sentinel.get(handle)
+                if cluster_id is not None and cluster_id in self.workers:
+                    self._reap(cluster_id)
+
+            self._finish_stats_requests()
+            if self.running:
+                self._restart_due()
+
+        logger.info("👋 All clusters stopped")
+
+def run_cluster():
+    """Start the cluster supervisor using CLUSTER_PROCESSES and SHARD_COUNT"""
+    validate_config()
+    shard_count = config.SHARD_COUNT or asyncio.run(fetch_recommended_shards(config.DISCORD_TOKEN))
+    shard_ranges = split_shards(shard_count, config.CLUSTER_PROCESSES)
+    logger.info(f"🚀 Starting {len(shard_ranges)} clusters for {shard_count} shards")
+    ClusterSupervisor(shard_ranges, shard_count).run()
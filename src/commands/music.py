@@ -3,25 +3,155 @@ Music commands for Discord bot
 """
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
 import logging
+import time
+from src.config import config
+from src.services.executors import api_pool, extraction_pool
 from src.services.music_player import MusicPlayer
 from src.services.spotify_service import SpotifyService
+from src.services.stream_resolver import StreamResolver
+from src.services.track_matcher import TrackMatcher
 from src.services.youtube_service import YouTubeService
+from src.utils.cache import metadata_cache
 from src.utils.logger import get_logger
+from src.utils.loop_monitor import loop_monitor
+from src.utils.metrics import Counter, Gauge, Histogram
+from src.utils.single_flight import single_flight_stats
+from src.utils import url_router
 
 logger = get_logger(__name__)
 
+# Minimum seconds between progress edits while a playlist is loading
+PROGRESS_UPDATE_INTERVAL = 2.0
+
+# Discord rejects embed field values longer than this
+EMBED_FIELD_LIMIT = 1024
+
+# Shards and clusters listed individually in !stats, worst latency first
+STATS_TOP_ENTRIES = 5
+
+def format_duration(seconds):
+    """Format a duration in seconds as H:MM:SS or M:SS"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+PLAY_REQUESTS = Counter(
+    'musicbot_play_requests_total', 'Play requests by query kind and outcome', ['kind', 'outcome']
+)
+PLAY_REQUEST_SECONDS = Histogram(
+    'musicbot_play_request_seconds', 'Time to handle a play request until it is queued', ['kind']
+)
+QUEUED_TRACKS = Gauge('musicbot_queued_tracks', 'Tracks waiting in guild queues', ['shard'])
+VOICE_SESSIONS = Gauge('musicbot_voice_sessions', 'Connected voice clients', ['shard'])
+REAPED_SESSIONS = Counter(
+    'musicbot_reaped_sessions_total', 'Voice sessions left by the idle reaper', ['shard', 'reason']
+)
+
 class MusicCog(commands.Cog):
     """Music commands cog"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.music_player = MusicPlayer()
-        self.spotify_service = SpotifyService()
+        # One YouTube/yt-dlp client, stream cache and matcher shared by every shard
         self.youtube_service = YouTubeService()
+        self.spotify_service = SpotifyService()
+        self.stream_resolver = StreamResolver(self.youtube_service)
+        self.track_matcher = TrackMatcher(self.youtube_service)
+        
+        # Playback state is partitioned by shard
+        self.players = {}
+        
+        # Queue and session gauges are computed only when metrics are scraped
+        QUEUED_TRACKS.set_function(lambda: {
+            (shard_id,): sum(len(queue) for queue in player.queues.values())
+            for shard_id, player in self.players.items()
+        })
+        VOICE_SESSIONS.set_function(lambda: {
+            (shard_id,): len(player.voice_clients) for shard_id, player in self.players.items()
+        })
+        REAPED_SESSIONS.set_function(lambda: {
+            (shard_id, reason): count
+            for shard_id, player in self.players.items()
+            for reason, count in player.reaped.items()
+        })
+    
+    def get_player(self, guild):
+        """Get the music player for the shard that owns a guild"""
+        shard_id = guild.shard_id
+        if shard_id not in self.players:
+            self.players[shard_id] = MusicPlayer(
+                self.youtube_service,
+                stream_resolver=self.stream_resolver,
+                track_matcher=self.track_matcher,
+                shard_id=shard_id
+            )
+        return self.players[shard_id]
+    
+    async def cog_before_invoke(self, ctx):
+        """Restore the guild's saved queue the first time one of its commands runs"""
+        ctx.command_started_at = time.perf_counter()
+        if ctx.guild:
+            await self.get_player(ctx.guild).restore(ctx.guild)
+    
+    async def cog_after_invoke(self, ctx):
+        """Record how long the command took"""
+        started_at = getattr(ctx, 'command_started_at', None)
+        if started_at is not None and loop_monitor.enabled:
+            loop_monitor.record_command(ctx.command.qualified_name, time.perf_counter() - started_at)
+    
+    async def cog_load(self):
+        """Start the idle session reaper"""
+        self.reap_idle_sessions.change_interval(seconds=config.REAPER_INTERVAL)
+        self.reap_idle_sessions.start()
+    
+    async def cog_unload(self):
+        """Save playback positions before the bot disconnects"""
+        self.reap_idle_sessions.cancel()
+        for player in self.players.values():
+            await player.shutdown()
+    
+    @tasks.loop(seconds=30)
+    async def reap_idle_sessions(self):
+        """Leave idle or empty voice channels and free per-guild state"""
+        for player in list(self.players.values()):
+            try:
+                await player.reap_idle()
+            except Exception as error:
+                logger.error(f"Idle session reaper failed: {error}")
+    
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        """Notice when the bot is left alone in a channel or disconnected externally"""
+        player = self.players.get(member.guild.shard_id)
+        if player is None:
+            return
+        
+        guild_id = member.guild.id
+        voice_client = player.voice_clients.get(guild_id)
+        if voice_client is None:
+            return
+        
+        if member.id == self.bot.user.id and after.channel is None:
+            # Kicked or disconnected by someone else
+            player.stop(guild_id)
+            player.release(guild_id)
+            return
+        
+        if voice_client.channel in (before.channel, after.channel):
+            player.update_listeners(guild_id, voice_client.channel)
+    
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction, command):
+        """Record how long a slash command took from the interaction arriving"""
+        if loop_monitor.enabled and getattr(command, 'binding', None) is self:
+            elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+            loop_monitor.record_command(f"/{command.qualified_name}", max(0.0, elapsed))
     
     async def cog_check(self, ctx):
         """Check if user is in a voice channel"""
@@ -48,71 +178,130 @@ class MusicCog(commands.Cog):
         ctx = await self.bot.get_context(interaction)
         ctx.send = interaction.followup.send
         
+        await self.get_player(ctx.guild).restore(ctx.guild)
         await self._play_music(ctx, query)
     
+    def _requester_name(self, ctx, track):
+        """Get the display name of the member who requested a track"""
+        member = ctx.guild.get_member(track.requested_by)
+        return member.display_name if member else f"<@{track.requested_by}>"
+    
+    def _progress_updater(self, message, name, noun):
+        """Build a throttled callback that reports playlist loading progress"""
+        last_update = time.monotonic()
+        
+        async def update(count):
+            nonlocal last_update
+            now = time.monotonic()
+            if now - last_update < PROGRESS_UPDATE_INTERVAL:
+                return
+            last_update = now
+            
+            try:
+                await message.edit(content=f"⏳ Added {count} {noun} from **{name}** so far...")
+            except discord.HTTPException as error:
+                logger.warning(f"Failed to update progress message: {error}")
+        
+        return update
+    
     async def _play_music(self, ctx, query: str):
         """Internal method to handle music playing logic"""
+        requested_at = time.monotonic()
+        kind = 'unknown'
+        outcome = 'error'
         try:
             processing_msg = await ctx.send("🔍 Processing your request...")
+            music_player = self.get_player(ctx.guild)
             
             # Join voice channel
             voice_channel = ctx.author.voice.channel
-            await self.music_player.join_channel(voice_channel)
+            await music_player.join_channel(voice_channel)
+            
+            # Classify the query once without touching the network
+            route = url_router.route_url(query)
             
-            # Handle Spotify playlist
-            if self.spotify_service.is_spotify_url(query):
-                playlist_id = self.spotify_service.extract_playlist_id(query)
-                if not playlist_id:
-                    await processing_msg.edit(content="❌ Invalid Spotify playlist URL!")
+            # Several pasted links route as a search, so only split queries led by a Spotify link
+            parts = query.split()
+            if len(parts) > 1 and 'spotify' in parts[0].lower():
+                routes = [url_router.route_url(part) for part in parts]
+            else:
+                routes = [route]
+            
+            # Handle one or more Spotify playlist, album, track or artist links
+            if all(link.kind in url_router.SPOTIFY_LINKS for link in routes):
+                kind = route.kind if len(routes) == 1 else 'spotify_links'
+                spotify_routes = [link for link in routes if link.spotify_id]
+                if not spotify_routes:
+                    outcome = 'invalid'
+                    await processing_msg.edit(content="❌ Invalid Spotify link!")
                     return
                 
-                playlist = await self.spotify_service.get_playlist_tracks(playlist_id)
-                added_count = await self.music_player.add_playlist_to_queue(
-                    ctx.guild.id, playlist, ctx.author
+                playlist = await self.spotify_service.open_links(spotify_routes)
+                added_count = await music_player.add_playlist_to_queue(
+                    ctx.guild.id, playlist, ctx.author.id,
+                    on_progress=self._progress_updater(processing_msg, playlist['name'], 'songs'),
+                    requested_at=requested_at
                 )
                 
+                outcome = 'ok'
                 await processing_msg.edit(
                     content=f"✅ Added {added_count} songs from **{playlist['name']}** to the queue!"
                 )
                 return
             
             # Handle YouTube playlist
-            if self.youtube_service.is_youtube_playlist_url(query):
-                playlist_id = self.youtube_service.extract_playlist_id(query)
-                if not playlist_id:
+            if route.kind == url_router.YOUTUBE_PLAYLIST:
+                kind = 'youtube_playlist'
+                if not route.playlist_id:
+                    outcome = 'invalid'
                     await processing_msg.edit(content="❌ Invalid YouTube playlist URL!")
                     return
                 
-                playlist = await self.youtube_service.get_playlist_videos(playlist_id)
-                added_count = await self.music_player.add_playlist_to_queue(
-                    ctx.guild.id, playlist, ctx.author
+                playlist = await self.youtube_service.open_playlist(route.playlist_id)
+                added_count = await music_player.add_playlist_to_queue(
+                    ctx.guild.id, playlist, ctx.author.id,
+                    on_progress=self._progress_updater(processing_msg, playlist['name'], 'videos'),
+                    requested_at=requested_at
                 )
                 
+                outcome = 'ok'
                 await processing_msg.edit(
                     content=f"✅ Added {added_count} videos from **{playlist['name']}** to the queue!"
                 )
                 return
             
-            # Handle single YouTube video
-            if self.youtube_service.is_youtube_video_url(query):
-                video_info = await self.youtube_service.get_video_info(query)
-                await self.music_player.add_to_queue(ctx.guild.id, video_info, ctx.author)
+            # Handle single YouTube video (or any other URL yt-dlp understands)
+            if route.kind in (url_router.YOUTUBE_VIDEO, url_router.URL):
+                kind = route.kind
+                video_info = await music_player.load_video(query)
+                await music_player.add_to_queue(
+                    ctx.guild.id, video_info, ctx.author.id, requested_at=requested_at
+                )
+                outcome = 'ok'
                 await processing_msg.edit(content=f"✅ Added **{video_info['title']}** to the queue!")
                 return
             
             # Handle search query
+            kind = 'search'
             search_results = await self.youtube_service.search_videos(query, 1)
             if not search_results:
+                outcome = 'not_found'
                 await processing_msg.edit(content="❌ No videos found for your search query!")
                 return
             
             video = search_results[0]
-            await self.music_player.add_to_queue(ctx.guild.id, video, ctx.author)
+            await music_player.add_to_queue(
+                ctx.guild.id, video, ctx.author.id, requested_at=requested_at
+            )
+            outcome = 'ok'
             await processing_msg.edit(content=f"✅ Added **{video['title']}** to the queue!")
             
         except Exception as error:
             logger.error(f"Play command error: {error}")
             await ctx.send(f"❌ {error}")
+        finally:
+            PLAY_REQUESTS.labels(kind, outcome).inc()
+            PLAY_REQUEST_SECONDS.labels(kind).observe(time.monotonic() - requested_at)
     
     @commands.command(name='search')
     async def search_command(self, ctx, *, query: str = None):
@@ -150,7 +339,7 @@ class MusicCog(commands.Cog):
     @commands.command(name='skip', aliases=['s'])
     async def skip_command(self, ctx):
         """Skip the current song"""
-        if self.music_player.skip(ctx.guild.id):
+        if self.get_player(ctx.guild).skip(ctx.guild.id):
             await ctx.send("⏭️ Skipped to the next song!")
         else:
             await ctx.send("❌ No songs to skip!")
@@ -158,28 +347,30 @@ class MusicCog(commands.Cog):
     @commands.command(name='pause')
     async def pause_command(self, ctx):
         """Pause the current song"""
-        self.music_player.pause(ctx.guild.id)
+        self.get_player(ctx.guild).pause(ctx.guild.id)
         await ctx.send("⏸️ Paused the music!")
     
     @commands.command(name='resume', aliases=['r'])
     async def resume_command(self, ctx):
         """Resume the current song"""
-        self.music_player.resume(ctx.guild.id)
+        self.get_player(ctx.guild).resume(ctx.guild.id)
         await ctx.send("▶️ Resumed the music!")
     
     @commands.command(name='stop')
     async def stop_command(self, ctx):
         """Stop music and clear the queue"""
-        self.music_player.stop(ctx.guild.id)
+        self.get_player(ctx.guild).stop(ctx.guild.id)
         await ctx.send("⏹️ Stopped the music and cleared the queue!")
     
     @commands.command(name='queue', aliases=['q'])
     async def queue_command(self, ctx):
         """Show the current music queue"""
-        queue = self.music_player.get_current_queue(ctx.guild.id)
-        current_track = self.music_player.get_current_track(ctx.guild.id)
+        music_player = self.get_player(ctx.guild)
+        queue = music_player.get_queue(ctx.guild.id)
+        current_track = music_player.get_current_track(ctx.guild.id)
+        total_songs = len(queue) + (1 if current_track else 0)
         
-        if not queue:
+        if not total_songs:
             await ctx.send("📭 The queue is empty!")
             return
         
@@ -190,27 +381,29 @@ class MusicCog(commands.Cog):
         # Show currently playing song
         if current_track:
             description += f"**🎵 Now Playing:**\n"
-            description += f"{current_track['title']}"
-            if current_track.get('author'):
-                description += f" by {current_track['author']}"
-            description += f" (requested by {current_track['requested_by'].display_name})\n\n"
+            description += f"{current_track.title}"
+            if current_track.author:
+                description += f" by {current_track.author}"
+            description += f" (requested by {self._requester_name(ctx, current_track)})\n\n"
         
         # Show upcoming songs
-        upcoming_songs = queue[1:11] if current_track else queue[:10]
+        upcoming_songs = queue.slice(0, 10)
         if upcoming_songs:
             description += "**📋 Up Next:**\n"
             for i, track in enumerate(upcoming_songs, 1):
                 position = i + 1 if current_track else i
-                description += f"{position}. **{track['title']}"
-                if track.get('author'):
-                    description += f" by {track['author']}"
-                description += f"** (requested by {track['requested_by'].display_name})\n"
+                description += f"{position}. **{track.title}"
+                if track.author:
+                    description += f" by {track.author}"
+                description += f"** (requested by {self._requester_name(ctx, track)})\n"
         
         embed.description = description
         
-        footer_text = f"{len(queue)} song(s) in queue"
-        if len(queue) > 10:
-            footer_text = f"... and {len(queue) - 10} more songs"
+        footer_text = f"{total_songs} song(s) in queue"
+        if total_songs > 10:
+            footer_text = f"... and {total_songs - 10} more songs"
+        if queue.total_duration:
+            footer_text += f" • {format_duration(queue.total_duration)} queued"
         embed.set_footer(text=footer_text)
         
         await ctx.send(embed=embed)
@@ -218,7 +411,7 @@ class MusicCog(commands.Cog):
     @commands.command(name='nowplaying', aliases=['np'])
     async def nowplaying_command(self, ctx):
         """Show the currently playing song"""
-        current_track = self.music_player.get_current_track(ctx.guild.id)
+        current_track = self.get_player(ctx.guild).get_current_track(ctx.guild.id)
         
         if not current_track:
             await ctx.send("❌ Nothing is currently playing!")
@@ -226,22 +419,171 @@ class MusicCog(commands.Cog):
         
         embed = discord.Embed(title="🎵 Now Playing", color=0x00ff00)
         
-        description = f"**{current_track['title']}**\n"
-        if current_track.get('author'):
-            description += f"by {current_track['author']}\n"
-        description += f"Requested by {current_track['requested_by'].display_name}"
+        description = f"**{current_track.title}**\n"
+        if current_track.author:
+            description += f"by {current_track.author}\n"
+        description += f"Requested by {self._requester_name(ctx, current_track)}"
         
         embed.description = description
         
-        if current_track.get('thumbnail'):
-            embed.set_thumbnail(url=current_track['thumbnail'])
+        if current_track.thumbnail:
+            embed.set_thumbnail(url=current_track.thumbnail)
         
         await ctx.send(embed=embed)
     
+    @commands.command(name='stats')
+    async def stats_command(self, ctx):
+        """Show bot performance statistics"""
+        embed = discord.Embed(title="📊 Bot Statistics", color=0x00ff00)
+        
+        cache_lines = []
+        for namespace, counters in sorted(metadata_cache.stats().items()):
+            hits = counters['memory_hits'] + counters['disk_hits']
+            total = hits + counters['misses']
+            cache_lines.append(
+                f"`{namespace}`: {hits}/{total} hits "
+                f"({counters['memory_hits']} memory, {counters['disk_hits']} disk)"
+            )
+        
+        embed.add_field(
+            name="🗄️ Metadata Cache",
+            value="\n".join(cache_lines) or "No lookups yet",
+            inline=False
+        )
+        
+        pool_lines = [
+            f"`{pool.name}`: {stats['active']}/{pool.max_workers} busy, {stats['waiting']} waiting"
+            for pool, stats in ((pool, pool.stats()) for pool in (extraction_pool, api_pool))
+        ]
+        embed.add_field(name="🧵 Worker Pools", value="\n".join(pool_lines), inline=False)
+        
+        flight_lines = [
+            f"`{name}`: {stats['joined']}/{stats['started'] + stats['joined']} joined, "
+            f"{stats['in_flight']} in flight"
+            for name, stats in sorted(single_flight_stats().items())
+        ]
+        embed.add_field(name="🔗 Coalesced Requests", value="\n".join(flight_lines) or "None yet", inline=False)
+        
+        shards = self.bot.get_shard_stats()
+        for shard_id, stats in shards.items():
+            player = self.players.get(shard_id)
+            stats['queued'] = sum(len(queue) for queue in player.queues.values()) if player else 0
+        
+        # Large deployments have too many shards to list, so show totals and the slowest few
+        shard_lines = []
+        if shards:
+            shard_lines.append(
+                f"{len(shards)} shards: {sum(stats['guilds'] for stats in shards.values())} guilds, "
+                f"{sum(stats['voice_clients'] for stats in shards.values())} voice, "
+                f"{sum(stats['queued'] for stats in shards.values())} queued"
+            )
+        worst_shards = sorted(shards.items(), key=lambda item: item[1]['latency'], reverse=True)
+        shard_lines += [
+            f"`#{shard_id}`: {stats['latency'] * 1000:.0f}ms, {stats['guilds']} guilds, "
+            f"{stats['voice_clients']} voice, {stats['queued']} queued"
+            for shard_id, stats in worst_shards[:STATS_TOP_ENTRIES]
+        ]
+        sessions = [player.session_stats() for player in self.players.values()]
+        embed.add_field(
+            name="🔊 Voice Sessions",
+            value=(
+                f"{sum(stats['live'] for stats in sessions)} live, "
+                f"{sum(stats['playing'] for stats in sessions)} playing, "
+                f"{sum(stats['guild_states'] for stats in sessions)} guild queues\n"
+                f"Reaped: {sum(stats['reaped_idle'] for stats in sessions)} idle, "
+                f"{sum(stats['reaped_empty'] for stats in sessions)} empty"
+            ),
+            inline=False
+        )
+        
+        loop_stats = loop_monitor.stats()
+        if loop_stats['enabled'] or loop_stats['slow_callbacks'] or loop_stats['commands']:
+            loop_lines = [
+                f"Lag: {loop_stats['lag_p50'] * 1000:.0f}ms p50, {loop_stats['lag_p99'] * 1000:.0f}ms p99, "
+                f"{loop_stats['lag_max'] * 1000:.0f}ms max"
+                + ("" if loop_stats['enabled'] else " (monitor off)"),
+                f"Slow callbacks: {loop_stats['slow_callbacks']}"
+            ]
+            loop_lines += [
+                f"`{location}`: {offender['max'] * 1000:.0f}ms max, {offender['count']}x"
+                for location, offender in loop_stats['offenders']
+            ]
+            if loop_stats['commands']:
+                loop_lines.append("Slowest commands: " + ", ".join(
+                    f"`{name}` {command['max'] * 1000:.0f}ms"
+                    for name, command in loop_stats['commands']
+                ))
+            embed.add_field(name="⏱️ Event Loop", value="\n".join(loop_lines)[:EMBED_FIELD_LIMIT], inline=False)
+        
+        embed.add_field(
+            name="🔀 Shards",
+            value="\n".join(shard_lines)[:EMBED_FIELD_LIMIT] or "No shards connected",
+            inline=False
+        )
+        
+        if self.bot.cluster:
+            try:
+                clusters = await self.bot.cluster.fetch_stats()
+            except asyncio.TimeoutError:
+                clusters = {}
+            cluster_lines = [
+                f"Total: {len(clusters)} clusters, "
+                f"{sum(stats['guilds'] for stats in clusters.values())} guilds, "
+                f"{sum(stats['voice_clients'] for stats in clusters.values())} voice"
+            ]
+            worst_clusters = sorted(
+                ((cluster_id, stats) for cluster_id, stats in clusters.items() if stats['shards']),
+                key=lambda item: item[1]['latency'], reverse=True
+            )
+            cluster_lines += [
+                f"`{cluster_id}`: shards {stats['shards'][0]}-{stats['shards'][-1]}, "
+                f"{stats['guilds']} guilds, {stats['voice_clients']} voice, "
+                f"{stats['latency'] * 1000:.0f}ms"
+                for cluster_id, stats in worst_clusters[:STATS_TOP_ENTRIES]
+            ]
+            embed.add_field(
+                name=f"🧩 Clusters (this is #{self.bot.cluster.cluster_id})",
+                value="\n".join(cluster_lines)[:EMBED_FIELD_LIMIT],
+                inline=False
+            )
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='loopmonitor')
+    @commands.is_owner()
+    async def loop_monitor_command(self, ctx, state: str = None):
+        """Turn the event loop monitor on or off"""
+        if state is not None:
+            state = state.lower()
+            if state not in ('on', 'off'):
+                await ctx.send(f"❌ Usage: `{ctx.prefix}loopmonitor [on|off]`")
+                return
+            if self.bot.cluster:
+                # Every cluster, this one included, applies the change from the broadcast
+                self.bot.cluster.broadcast('loop_monitor', state)
+                await ctx.send(f"⏱️ Turning the event loop monitor {state} in every cluster")
+                return
+            self.set_loop_monitor(state)
+        
+        status = "on" if loop_monitor.enabled else "off"
+        await ctx.send(f"⏱️ Event loop monitor is {status}")
+    
+    def set_loop_monitor(self, state):
+        """Start or stop the event loop monitor in this process"""
+        if state == 'on':
+            loop_monitor.start()
+        else:
+            loop_monitor.stop()
+    
+    @commands.Cog.listener()
+    async def on_cluster_loop_monitor(self, state):
+        """Apply a !loopmonitor change broadcast by any cluster"""
+        self.set_loop_monitor(state)
+    
     @commands.command(name='leave', aliases=['disconnect'])
     async def leave_command(self, ctx):
         """Leave the voice channel"""
-        if self.music_player.leave(ctx.guild.id):
+        if await self.get_player(ctx.guild).leave(ctx.guild.id):
             await ctx.send("👋 Left the voice channel!")
         else:
             await ctx.send("❌ I'm not in a voice channel!")
@@ -265,6 +607,8 @@ class MusicCog(commands.Cog):
             f"`{ctx.prefix}leave` - Leave voice channel",
             f"`{ctx.prefix}search [query]` - Search for videos",
             f"`{ctx.prefix}nowplaying` - Show currently playing song",
+            f"`{ctx.prefix}stats` - Show bot statistics",
+            f"`{ctx.prefix}loopmonitor [on|off]` - Toggle the event loop monitor (owner only)",
         ]
         
         embed.add_field(
@@ -275,6 +619,7 @@ class MusicCog(commands.Cog):
         
         examples = [
             f"`{ctx.prefix}play https://open.spotify.com/playlist/...`",
+            f"`{ctx.prefix}play https://open.spotify.com/album/... https://open.spotify.com/track/...`",
             f"`{ctx.prefix}play https://www.youtube.com/watch?v=...`",
             f"`{ctx.prefix}play https://www.youtube.com/playlist?list=...`",
             "You can also use `/` slash commands (just type `/` and see the options):",
@@ -287,7 +632,7 @@ class MusicCog(commands.Cog):
             inline=False
         )
         
-        embed.set_footer(text="Supports YouTube/Spotify playlists and search!")
+        embed.set_footer(text="Supports YouTube playlists, Spotify playlists/albums/tracks/artists and search!")
         
         await ctx.send(embed=embed)
     
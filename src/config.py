@@ -23,8 +23,63 @@ class Config:
     # Bot settings
     PREFIX = os.getenv('PREFIX', '!')
     
+    # Sharding settings (leave empty to let Discord pick the shard count)
+    SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+    SHARD_IDS = [int(shard) for shard in os.getenv('SHARD_IDS', '').split(',') if shard.strip()] or None
+    # Bot processes to split the shards across (1 runs everything in this process)
+    CLUSTER_PROCESSES = int(os.getenv('CLUSTER_PROCESSES', '1'))
+    
+    # Metrics endpoint (0 disables it; cluster processes add their cluster ID to the port)
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    
+    # Event loop monitor (drift sampling period and the blocking time reported with a stack)
+    LOOP_MONITOR = os.getenv('LOOP_MONITOR', 'true').lower() in ('1', 'true', 'yes')
+    LOOP_MONITOR_INTERVAL = float(os.getenv('LOOP_MONITOR_INTERVAL', '0.25'))
+    SLOW_CALLBACK_THRESHOLD = float(os.getenv('SLOW_CALLBACK_THRESHOLD', '0.1'))
+    
     # YouTube settings
     YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+    
+    # Search backend: 'auto' (Data API with yt-dlp fallback), 'api' or 'ytdlp'
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto').lower()
+    SEARCH_QUOTA_COOLDOWN = int(os.getenv('SEARCH_QUOTA_COOLDOWN', '3600'))
+    
+    # Playback settings
+    PREFETCH_COUNT = int(os.getenv('PREFETCH_COUNT', '3'))
+    PREFETCH_CONCURRENCY = int(os.getenv('PREFETCH_CONCURRENCY', '2'))
+    STREAM_CACHE_SIZE = int(os.getenv('STREAM_CACHE_SIZE', '1000'))
+    STREAM_EXPIRY_MARGIN = int(os.getenv('STREAM_EXPIRY_MARGIN', '600'))
+    
+    # Queue persistence settings (leave QUEUE_STORE_PATH empty to keep queues in memory only)
+    QUEUE_STORE_PATH = os.getenv('QUEUE_STORE_PATH', 'data/queues.sqlite3')
+    POSITION_CHECKPOINT_INTERVAL = int(os.getenv('POSITION_CHECKPOINT_INTERVAL', '15'))
+    
+    # Idle session settings (seconds without playback, seconds alone in a channel, reaper period)
+    IDLE_TIMEOUT = int(os.getenv('IDLE_TIMEOUT', '300'))
+    EMPTY_CHANNEL_TIMEOUT = int(os.getenv('EMPTY_CHANNEL_TIMEOUT', '60'))
+    REAPER_INTERVAL = int(os.getenv('REAPER_INTERVAL', '30'))
+    
+    # Spotify-to-YouTube matching settings (searches per second or 0 for no limit, burst size, parallel searches)
+    MATCH_SEARCH_RATE = float(os.getenv('MATCH_SEARCH_RATE', '1.0'))
+    MATCH_SEARCH_BURST = int(os.getenv('MATCH_SEARCH_BURST', '5'))
+    # Data API quota units per day that background matching may spend (0 matches only at play time)
+    MATCH_DAILY_QUOTA_UNITS = int(os.getenv('MATCH_DAILY_QUOTA_UNITS', '2000'))
+    MATCH_CONCURRENCY = int(os.getenv('MATCH_CONCURRENCY', '4'))
+    
+    # Worker pool settings
+    EXTRACTION_BACKEND = os.getenv('EXTRACTION_BACKEND', 'thread').lower()
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', '4'))
+    EXTRACTION_WORKER_MAX_TASKS = int(os.getenv('EXTRACTION_WORKER_MAX_TASKS', '100'))
+    API_WORKERS = int(os.getenv('API_WORKERS', '8'))
+    
+    # Metadata cache settings (leave CACHE_PATH empty for memory-only caching)
+    CACHE_PATH = os.getenv('CACHE_PATH', 'data/cache.sqlite3')
+    CACHE_MEMORY_ENTRIES = int(os.getenv('CACHE_MEMORY_ENTRIES', '2000'))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '100000'))
+    SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', '604800'))
+    VIDEO_INFO_CACHE_TTL = int(os.getenv('VIDEO_INFO_CACHE_TTL', '86400'))
+    SPOTIFY_MATCH_CACHE_TTL = int(os.getenv('SPOTIFY_MATCH_CACHE_TTL', '2592000'))
 
 def validate_config():
     """Validate required configuration values"""
@@ -41,6 +96,10 @@ def validate_config():
     
     if not Config.YOUTUBE_API_KEY:
         logging.warning("YouTube API key not provided. Search and playlist features will be limited.")
+    
+    if Config.SHARD_IDS and not Config.SHARD_COUNT:
+        logging.error("SHARD_IDS requires SHARD_COUNT to be set")
+        exit(1)
 
 # Global config instance
 config = Config()
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Audio source factory for creating the cheapest playable source for a stream
+"""
+
+import discord
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FFMPEG_OPTIONS = {
+    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
+    'options': '-vn'
+}
+
+# yt-dlp reports audio codecs such as 'opus' or 'mp4a.40.2'
+OPUS_CODECS = ('opus', 'libopus')
+
+def ffmpeg_options(start=0):
+    """FFmpeg options, seeking the input to start seconds when resuming"""
+    if not start:
+        return FFMPEG_OPTIONS
+    return {
+        **FFMPEG_OPTIONS,
+        'before_options': f"-ss {start:.2f} {FFMPEG_OPTIONS['before_options']}"
+    }
+
+async def create_audio_source(stream, start=0):
+    """Create an Opus source for a resolved stream, avoiding in-process PCM encoding
+
+    Opus streams are passed through with -c:a copy. Other known codecs are
+    transcoded to Opus by ffmpeg itself. Unknown codecs are probed, and PCM
+    is only used when probing fails. A non-zero start seeks the input first.
+    """
+    url = stream['url']
+    codec = stream.get('acodec')
+    options = ffmpeg_options(start)
+
+    if codec in OPUS_CODECS:
+        logger.info("Using Opus passthrough")
+        return discord.FFmpegOpusAudio(url, codec='opus', **options)
+
+    if codec and codec != 'none':
+        logger.info(f"Transcoding {codec} to Opus in ffmpeg")
+        return discord.FFmpegOpusAudio(url, **options)
+
+    try:
+        return await discord.FFmpegOpusAudio.from_probe(url, **options)
+    except Exception as error:
+        logger.warning(f"Codec probe failed, falling back to PCM: {error}")
+        return discord.FFmpegPCMAudio(url, **options)
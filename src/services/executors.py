@@ -0,0 +1,186 @@
+"""
+Bounded worker pools for blocking yt-dlp and API calls
+"""
+
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from src.config import config
+from src.services import extraction_worker
+from src.utils.logger import get_logger
+from src.utils.metrics import Gauge, Histogram
+
+logger = get_logger(__name__)
+
+POOL_WAIT_SECONDS = Histogram(
+    'musicbot_pool_wait_seconds', 'Time calls spend queued for a worker slot', ['pool', 'priority']
+)
+POOL_ACTIVE = Gauge('musicbot_pool_active', 'Calls running in each worker pool', ['pool'])
+POOL_WAITING = Gauge('musicbot_pool_waiting', 'Calls queued for each worker pool', ['pool'])
+
+# Work priorities (lower runs first)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+class RecyclingProcessExecutor(Executor):
+    """Process pool of warm yt-dlp workers, each replaced after a fixed number of tasks"""
+
+    def __init__(self, max_workers, max_tasks_per_worker=100):
+        self.max_workers = max_workers
+        self.max_tasks_per_worker = max_tasks_per_worker or None
+
+        # Created by start() or the first submit, never at import time, since
+        # spawned workers re-import the main module
+        self.pool = None
+
+    def start(self):
+        """Start the worker processes ahead of the first extraction"""
+        if self.pool is None:
+            self.pool = self._new_pool()
+
+    def _new_pool(self):
+        context = multiprocessing.get_context('spawn')
+        if sys.version_info < (3, 11):
+            # ProcessPoolExecutor can only recycle single workers from 3.11 on
+            return context.Pool(
+                self.max_workers,
+                initializer=extraction_worker.init_worker,
+                maxtasksperchild=self.max_tasks_per_worker
+            )
+
+        # Workers are replaced one at a time to bound yt-dlp's memory growth
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=extraction_worker.init_worker,
+            max_tasks_per_child=self.max_tasks_per_worker
+        )
+
+        # Start every worker now so the first extractions don't pay for imports
+        for _ in range(self.max_workers):
+            pool.submit(extraction_worker.warm_up)
+        return pool
+
+    def submit(self, fn, *args, **kwargs):
+        self.start()
+        if isinstance(self.pool, ProcessPoolExecutor):
+            return self.pool.submit(fn, *args, **kwargs)
+
+        # Tasks handed to a multiprocessing pool cannot be withdrawn, so mark them running
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self.pool.apply_async(
+            fn, args, kwargs, callback=future.set_result, error_callback=future.set_exception
+        )
+        return future
+
+    def shutdown(self, wait=True, **kwargs):
+        if isinstance(self.pool, ProcessPoolExecutor):
+            self.pool.shutdown(wait=wait)
+        elif self.pool:
+            self.pool.close()
+            if wait:
+                self.pool.join()
+
+class PriorityPool:
+    """Sized worker pool that dispatches interactive work ahead of background work"""
+
+    def __init__(self, name, max_workers, executor=None):
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self.uses_processes = isinstance(self.executor, RecyclingProcessExecutor)
+        self.active = 0
+        self.waiting = []
+        self.sequence = itertools.count()
+
+    async def _acquire(self, priority):
+        """Wait for a free worker slot"""
+        if self.active < self.max_workers and not self.waiting:
+            self.active += 1
+            return
+
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self.waiting, (priority, next(self.sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        """Hand a worker slot to the highest-priority waiter, or free it"""
+        while self.waiting:
+            _, _, future = heapq.heappop(self.waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    async def run(self, function, *args, priority=INTERACTIVE, **kwargs):
+        """Run a blocking function in the pool once a worker is free"""
+        queued_at = time.perf_counter()
+        await self._acquire(priority)
+        POOL_WAIT_SECONDS.labels(self.name, priority).observe(time.perf_counter() - queued_at)
+        loop = asyncio.get_event_loop()
+        try:
+            future = self.executor.submit(partial(function, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        
+        # The slot is held until the worker finishes, even if the caller is cancelled first
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        return await asyncio.wrap_future(future, loop=loop)
+    
+    def _release_threadsafe(self, loop):
+        """Release a slot from the executor's completion callback"""
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # The event loop has already closed
+            pass
+
+    def start(self):
+        """Start process-based workers early so they are warm for the first request"""
+        if self.uses_processes:
+            self.executor.start()
+
+    def stats(self):
+        """Get the number of running and queued calls"""
+        # Cancelled waiters stay in the heap until popped; drop them so they aren't counted
+        if any(future.done() for _, _, future in self.waiting):
+            self.waiting = [entry for entry in self.waiting if not entry[2].done()]
+            heapq.heapify(self.waiting)
+        return {'active': self.active, 'waiting': len(self.waiting)}
+
+def create_extraction_executor():
+    """Create the configured yt-dlp extraction backend"""
+    if config.EXTRACTION_BACKEND == 'process':
+        return RecyclingProcessExecutor(
+            config.EXTRACTION_WORKERS,
+            max_tasks_per_worker=config.EXTRACTION_WORKER_MAX_TASKS
+        )
+    return None
+
+# yt-dlp extraction is CPU-heavy, so it gets its own smaller pool
+extraction_pool = PriorityPool(
+    'ytdl', config.EXTRACTION_WORKERS, executor=create_extraction_executor()
+)
+
+# YouTube Data API and Spotify API calls
+api_pool = PriorityPool('api', config.API_WORKERS)
+
+POOL_ACTIVE.set_function(lambda: {(pool.name,): pool.active for pool in (extraction_pool, api_pool)})
+POOL_WAITING.set_function(
+    lambda: {(pool.name,): pool.stats()['waiting'] for pool in (extraction_pool, api_pool)}
+)
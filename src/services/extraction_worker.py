@@ -0,0 +1,107 @@
+"""
+yt-dlp extraction helpers shared by the thread and process extraction backends
+"""
+
+# yt-dlp options used for every extraction
+YTDL_OPTIONS = {
+    'format': 'bestaudio/best',
+    'outtmpl': '%(extractor)s-%(id)s-%(title)s.%(ext)s',
+    'restrictfilenames': True,
+    'noplaylist': True,
+    'nocheckcertificate': True,
+    'ignoreerrors': False,
+    'logtostderr': False,
+    'quiet': True,
+    'no_warnings': True,
+    'default_search': 'auto',
+    'source_address': '0.0.0.0'
+}
+
+# yt-dlp options for flat ytsearch queries (no per-video extraction)
+SEARCH_OPTIONS = {
+    'extract_flat': 'in_playlist',
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True
+}
+
+# Per-process YoutubeDL instances, created by init_worker
+_ytdl = None
+_search_ytdl = None
+
+def summarize_info(info):
+    """Reduce a yt-dlp info dict to the few fields playback and display need"""
+    if not info:
+        return None
+
+    stream_url = info.get('url')
+    acodec = info.get('acodec')
+
+    # Fall back to the best audio-only format if no format was selected
+    if not stream_url:
+        formats = [
+            fmt for fmt in info.get('formats') or []
+            if fmt.get('url') and fmt.get('acodec') not in (None, 'none')
+            and fmt.get('vcodec') in (None, 'none')
+        ]
+        if formats:
+            best = max(formats, key=lambda fmt: fmt.get('abr') or 0)
+            stream_url = best['url']
+            acodec = best.get('acodec')
+
+    return {
+        'id': info.get('id'),
+        'title': info.get('title'),
+        'duration': info.get('duration'),
+        'thumbnail': info.get('thumbnail'),
+        'uploader': info.get('uploader'),
+        'url': stream_url,
+        'acodec': acodec
+    }
+
+def summarize_search_entry(entry):
+    """Build a search result from a flat ytsearch entry"""
+    thumbnails = entry.get('thumbnails') or []
+    return {
+        'title': entry.get('title') or 'Unknown',
+        'url': f"https://www.youtube.com/watch?v={entry['id']}",
+        'thumbnail': thumbnails[0].get('url') if thumbnails else None,
+        'author': entry.get('channel') or entry.get('uploader'),
+        'duration': entry.get('duration')
+    }
+
+def init_worker(options=None):
+    """Pre-import yt-dlp and build this worker process's YoutubeDL instances"""
+    global _ytdl, _search_ytdl
+    import yt_dlp
+    _ytdl = yt_dlp.YoutubeDL(options or YTDL_OPTIONS)
+    _search_ytdl = yt_dlp.YoutubeDL(SEARCH_OPTIONS)
+
+def warm_up():
+    """No-op task used to start worker processes ahead of the first request"""
+    return True
+
+def extract(url):
+    """Extract a URL inside a worker process and return only the summary"""
+    if _ytdl is None:
+        init_worker()
+    try:
+        info = _ytdl.extract_info(url, download=False)
+    except Exception as error:
+        # yt-dlp errors carry unpicklable state and can't cross the process boundary
+        raise RuntimeError(str(error)) from None
+    return summarize_info(info)
+
+def search(query, max_results=5):
+    """Run a flat ytsearch query and return summarized results"""
+    if _search_ytdl is None:
+        init_worker()
+    try:
+        info = _search_ytdl.extract_info(f"ytsearch{max_results}:{query}", download=False)
+    except Exception as error:
+        raise RuntimeError(str(error)) from None
+    return [
+        summarize_search_entry(entry)
+        for entry in (info or {}).get('entries') or []
+        if entry and entry.get('id')
+    ]
@@ -0,0 +1,45 @@
+"""
+Queue data structure for a guild's upcoming tracks
+"""
+
+import itertools
+from collections import deque
+
+class GuildQueue:
+    """Deque-backed track queue with O(1) pop-front and a cached total duration"""
+
+    def __init__(self, tracks=()):
+        self.tracks = deque()
+        self.total_duration = 0
+        self.extend(tracks)
+
+    def append(self, track):
+        """Add a track to the end of the queue"""
+        self.tracks.append(track)
+        self.total_duration += track.duration
+
+    def extend(self, tracks):
+        """Add several tracks to the end of the queue"""
+        for track in tracks:
+            self.append(track)
+
+    def popleft(self):
+        """Remove and return the next track"""
+        track = self.tracks.popleft()
+        self.total_duration -= track.duration
+        return track
+
+    def clear(self):
+        """Remove all tracks"""
+        self.tracks.clear()
+        self.total_duration = 0
+
+    def slice(self, start=0, stop=None):
+        """Get a page of tracks without copying the whole queue"""
+        return list(itertools.islice(self.tracks, start, stop))
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __iter__(self):
+        return iter(self.tracks)
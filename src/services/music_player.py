@@ -2,28 +2,74 @@
 Music player service for handling audio playback
 """
 
-import discord
 import asyncio
 import logging
-from src.services.youtube_service import YouTubeService
+import time
+from src.config import config
+from src.services.audio_source import create_audio_source
+from src.services.executors import BACKGROUND, INTERACTIVE
+from src.services.guild_queue import GuildQueue
+from src.services.prefetcher import TrackPrefetcher
+from src.services.queue_store import queue_store
+from src.services.track import Track
+from src.services.track_matcher import TrackMatcher
+from src.services.stream_resolver import StreamResolver
 from src.utils.logger import get_logger
+from src.utils.metrics import Counter, Histogram
 
 logger = get_logger(__name__)
 
+TIME_TO_FIRST_AUDIO = Histogram(
+    'musicbot_time_to_first_audio_seconds',
+    'Time from a play request on an idle player to audio starting'
+)
+TRACK_RESOLVE_SECONDS = Histogram(
+    'musicbot_track_resolve_seconds', 'Time to turn a queued track into an audio source', ['outcome']
+)
+TRACKS_STARTED = Counter('musicbot_tracks_started_total', 'Tracks that started playing')
+PLAYBACK_FAILURES = Counter(
+    'musicbot_playback_failures_total', 'Tracks that failed to play, by stage', ['stage']
+)
+
+# Attempts to resolve a track before it is skipped, and the pause between them
+TRACK_RESOLVE_ATTEMPTS = 2
+TRACK_RETRY_DELAY = 1.0
+
 class MusicPlayer:
     """Music player class for handling audio playback"""
     
-    def __init__(self):
+    def __init__(self, youtube_service, stream_resolver=None, track_matcher=None, shard_id=None):
         self.queues = {}
         self.voice_clients = {}
         self.currently_playing = {}
         self.is_playing = {}
-        self.youtube_service = YouTubeService()
+        self.load_generations = {}
+        self.supervisors = {}
+        self.restores = {}
+        self.start_positions = {}
+        self.play_clocks = {}
+        self.last_active = {}
+        self.first_audio_requests = {}
+        self.empty_since = {}
+        self.disconnected = set()
+        self.reaped = {'idle': 0, 'empty': 0}
+        self.closing = False
+        self.shard_id = shard_id
+        self.youtube_service = youtube_service
+        
+        # Stream cache and matcher rate limits are shared across shards when provided
+        self.stream_resolver = stream_resolver or StreamResolver(self.youtube_service)
+        self.track_matcher = track_matcher or TrackMatcher(self.youtube_service)
+        self.prefetcher = TrackPrefetcher(
+            self._prefetch_track,
+            depth=config.PREFETCH_COUNT,
+            concurrency=config.PREFETCH_CONCURRENCY
+        )
     
     def get_queue(self, guild_id):
         """Get queue for a guild"""
         if guild_id not in self.queues:
-            self.queues[guild_id] = []
+            self.queues[guild_id] = GuildQueue()
         return self.queues[guild_id]
     
     async def join_channel(self, voice_channel):
@@ -38,6 +84,9 @@ class MusicPlayer:
                 voice_client = await voice_channel.connect()
                 self.voice_clients[guild_id] = voice_client
             
+            self.touch(guild_id)
+            # The bot's own join event fires before the client is stored, so check the channel here
+            self.update_listeners(guild_id, voice_channel)
             logger.info(f"Joined voice channel in guild {guild_id}")
             return self.voice_clients[guild_id]
             
@@ -45,140 +94,298 @@ class MusicPlayer:
             logger.error(f"Failed to join voice channel: {error}")
             raise error
     
-    async def add_to_queue(self, guild_id, track, requested_by):
+    async def add_to_queue(self, guild_id, track, requested_by, requested_at=None):
         """Add a single track to the queue"""
         queue = self.get_queue(guild_id)
         
-        queue_item = {
-            **track,
-            'requested_by': requested_by,
-            'added_at': asyncio.get_event_loop().time()
-        }
+        queue_item = Track.from_dict(
+            track,
+            requested_by=requested_by,
+            added_at=asyncio.get_event_loop().time()
+        )
         
         queue.append(queue_item)
-        logger.info(f"Added to queue: {track['title']} (Guild: {guild_id})")
+        queue_store.append(guild_id, [queue_item])
+        self.touch(guild_id)
+        logger.info(f"Added to queue: {queue_item.title} (Guild: {guild_id})")
         
         # Start playing if nothing is currently playing
         if not self.is_playing.get(guild_id, False):
+            self._mark_request(guild_id, requested_at)
             await self.play_next(guild_id)
+        else:
+            self.prefetcher.schedule(guild_id, queue)
         
         return queue_item
     
-    async def add_playlist_to_queue(self, guild_id, playlist, requested_by):
-        """Add a playlist to the queue"""
+    def _mark_request(self, guild_id, requested_at):
+        """Remember when a request on an idle player arrived, to time its first audio"""
+        if requested_at is not None:
+            self.first_audio_requests[guild_id] = requested_at
+    
+    @staticmethod
+    async def _single_page(tracks):
+        """Wrap an already-fetched track list as a one-page async iterator"""
+        yield tracks
+    
+    async def add_playlist_to_queue(self, guild_id, playlist, requested_by, on_progress=None,
+                                    requested_at=None):
+        """Add a playlist to the queue, starting playback as soon as the first page arrives
+        
+        The playlist's tracks may be a list or an async iterator of track pages.
+        """
         queue = self.get_queue(guild_id)
+        # A fresh token per stop, compared by identity so it survives state cleanup
+        generation = self.load_generations.setdefault(guild_id, object())
         
-        tracks = playlist.get('tracks', playlist.get('videos', []))
+        pages = playlist.get('tracks', playlist.get('videos', []))
+        if isinstance(pages, list):
+            pages = self._single_page(pages)
         
-        for track in tracks:
-            queue_item = {
-                **track,
-                'requested_by': requested_by,
-                'added_at': asyncio.get_event_loop().time(),
-                'is_playlist': True
-            }
-            queue.append(queue_item)
+        added_count = 0
+        try:
+            async for tracks in pages:
+                # Stop appending if the queue was stopped while the playlist was loading
+                if self.load_generations.get(guild_id) is not generation:
+                    logger.info(f"Playlist loading cancelled (Guild: {guild_id})")
+                    break
+                
+                added_at = asyncio.get_event_loop().time()
+                queue_items = [
+                    Track.from_dict(
+                        track,
+                        requested_by=requested_by,
+                        added_at=added_at,
+                        is_playlist=True
+                    )
+                    for track in tracks
+                ]
+                queue.extend(queue_items)
+                queue_store.append(guild_id, queue_items)
+                added_count += len(tracks)
+                
+                # Match Spotify tracks to YouTube ahead of playback
+                self.track_matcher.schedule(guild_id, queue_items)
+                
+                # Start playing if nothing is currently playing
+                if not self.is_playing.get(guild_id, False):
+                    self._mark_request(guild_id, requested_at)
+                    await self.play_next(guild_id)
+                else:
+                    self.prefetcher.schedule(guild_id, queue)
+                
+                if on_progress:
+                    await on_progress(added_count)
+        finally:
+            await pages.aclose()
         
-        logger.info(f"Added {len(tracks)} songs from playlist to queue (Guild: {guild_id})")
+        logger.info(f"Added {added_count} songs from playlist to queue (Guild: {guild_id})")
+        return added_count
+    
+    async def restore(self, guild):
+        """Reload a guild's saved queue the first time it is touched and resume playback"""
+        # Later commands wait for the first restore so queue order matches the journal
+        task = self.restores.get(guild.id)
+        if task is None:
+            task = self.restores[guild.id] = asyncio.ensure_future(self._restore(guild))
+        await asyncio.shield(task)
+    
+    async def _restore(self, guild):
+        guild_id = guild.id
+        channel_id, tracks, position = await queue_store.load(guild_id)
+        if not tracks:
+            return
         
-        # Start playing if nothing is currently playing
-        if not self.is_playing.get(guild_id, False):
-            await self.play_next(guild_id)
+        added_at = asyncio.get_event_loop().time()
+        queue_items = [
+            Track.from_dict(
+                track,
+                requested_by=track.get('requested_by'),
+                added_at=added_at,
+                is_playlist=track.get('is_playlist', False)
+            )
+            for track in tracks
+        ]
+        self.get_queue(guild_id).extend(queue_items)
+        if position:
+            self.start_positions[guild_id] = (queue_items[0], position)
+        logger.info(f"Restored {len(queue_items)} queued tracks (Guild: {guild_id})")
+        
+        channel = guild.get_channel(channel_id) if channel_id else None
+        if channel is None:
+            return
         
-        return len(tracks)
+        try:
+            await self.join_channel(channel)
+        except Exception as error:
+            logger.warning(f"Could not rejoin voice channel to resume playback: {error}")
+            return
+        
+        self.track_matcher.schedule(guild_id, queue_items)
+        await self.play_next(guild_id)
     
-    async def play_next(self, guild_id):
-        """Play the next song in the queue"""
-        queue = self.get_queue(guild_id)
-        voice_client = self.voice_clients.get(guild_id)
+    def get_position(self, guild_id):
+        """Seconds played of the current track, accounting for pauses"""
+        clock = self.play_clocks.get(guild_id)
+        if not clock:
+            return 0
+        offset, resumed_at = clock
+        return offset + (time.monotonic() - resumed_at if resumed_at is not None else 0)
+    
+    def _checkpoint(self, guild_id):
+        if guild_id in self.play_clocks:
+            queue_store.checkpoint(guild_id, self.get_position(guild_id))
+    
+    async def resolve_track(self, track, priority=INTERACTIVE):
+        """Resolve a queued track to a playable YouTube URL"""
+        # Spotify tracks only carry a search query until they are matched on YouTube
+        return await self.track_matcher.match(track, priority=priority)
+    
+    async def load_video(self, url):
+        """Extract a video once and reuse the result for both metadata and playback"""
+        video_info = await self.youtube_service.get_cached_video_info(url)
+        if video_info:
+            return video_info
+        
+        info = await self.stream_resolver.extract(url)
+        video_info = self.youtube_service.build_video_info(info, url)
+        await self.youtube_service.cache_video_info(video_info)
+        return video_info
+    
+    async def _prefetch_track(self, track, urgent):
+        """Prefetch callback for the look-ahead window
         
-        if not queue or not voice_client:
-            logger.info(f"Queue empty or no voice client for guild {guild_id}")
-            self.is_playing[guild_id] = False
-            if guild_id in self.currently_playing:
-                del self.currently_playing[guild_id]
+        The next track skips the background search budget, since it would be
+        matched interactively at play time anyway, but its stream extraction
+        still yields the extraction pool to tracks that are starting right now.
+        """
+        url = await self.resolve_track(track, priority=INTERACTIVE if urgent else BACKGROUND)
+        if not url:
+            return None
+        return await self.stream_resolver.resolve(url, priority=BACKGROUND)
+    
+    async def prepare_track(self, track, priority=INTERACTIVE):
+        """Resolve a queued track all the way to its direct audio stream"""
+        url = await self.resolve_track(track, priority=priority)
+        if not url:
+            return None
+        return await self.stream_resolver.resolve(url, priority=priority)
+    
+    async def play_next(self, guild_id):
+        """Start the guild's playback supervisor if it is not already running"""
+        task = self.supervisors.get(guild_id)
+        if task and not task.done():
             return
         
-        track = queue.pop(0)
-        self.currently_playing[guild_id] = track
+        self.is_playing[guild_id] = True
+        self.supervisors[guild_id] = asyncio.create_task(self._playback_loop(guild_id))
+    
+    async def _create_source(self, guild_id, track, start=0):
+        """Resolve a track to an audio source, retrying transient failures"""
+        # Use the look-ahead result if the track was already being resolved
+        await self.prefetcher.claim(guild_id, track)
+        
+        for attempt in range(1, TRACK_RESOLVE_ATTEMPTS + 1):
+            try:
+                audio_url = await self.resolve_track(track)
+                if not audio_url:
+                    logger.error(f"No URL available for track: {track.title}")
+                    return None
+                
+                # Resolve the direct audio stream (cached when prefetched or replayed)
+                stream = await self.stream_resolver.resolve(audio_url)
+                
+                logger.info(f"Creating audio source for: {audio_url}")
+                return await create_audio_source(stream, start=start)
+                
+            except Exception as error:
+                logger.error(f"Failed to prepare track: {track.title} (attempt {attempt}) - {error}")
+                if attempt < TRACK_RESOLVE_ATTEMPTS:
+                    await asyncio.sleep(TRACK_RETRY_DELAY)
+        
+        return None
+    
+    async def _playback_loop(self, guild_id):
+        """Play tracks from a guild's queue until it is empty"""
+        # after callbacks run on discord.py's audio thread, so capture the loop here
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
         
         try:
-            logger.info(f"Preparing to play: {track['title']} (Guild: {guild_id})")
-            
-            # Get audio URL
-            audio_url = track.get('url')
-            
-            # If it's a Spotify track or search query, search for it on YouTube
-            if track.get('search_query') and not audio_url:
-                logger.info(f"Searching YouTube for: {track['search_query']}")
-                search_results = await self.youtube_service.search_videos(track['search_query'], 1)
+            while True:
+                queue = self.get_queue(guild_id)
+                voice_client = self.voice_clients.get(guild_id)
                 
-                if not search_results:
-                    logger.error(f"No YouTube results found for: {track['search_query']}")
-                    await self.play_next(guild_id)
-                    return
+                if not queue or not voice_client or not voice_client.is_connected():
+                    logger.info(f"Queue empty or no voice client for guild {guild_id}")
+                    break
                 
-                audio_url = search_results[0]['url']
-                track['url'] = audio_url
-                logger.info(f"Found YouTube URL: {audio_url}")
-            
-            if not audio_url:
-                logger.error(f"No URL available for track: {track['title']}")
-                await self.play_next(guild_id)
-                return
-            
-            # Create audio source
-            logger.info(f"Creating audio source for: {audio_url}")
-            
-            # Use yt-dlp to get the audio stream
-            ytdl_format_options = {
-                'format': 'bestaudio/best',
-                'outtmpl': '%(extractor)s-%(id)s-%(title)s.%(ext)s',
-                'restrictfilenames': True,
-                'noplaylist': True,
-                'nocheckcertificate': True,
-                'ignoreerrors': False,
-                'logtostderr': False,
-                'quiet': True,
-                'no_warnings': True,
-                'default_search': 'auto',
-                'source_address': '0.0.0.0'
-            }
-            
-            ffmpeg_options = {
-                'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-                'options': '-vn'
-            }
-            
-            audio_source = discord.FFmpegPCMAudio(
-                audio_url,
-                **ffmpeg_options,
-                executable='ffmpeg'
-            )
-            
-            # Play the audio
-            def after_playing(error):
-                if error:
-                    logger.error(f"Player error: {error}")
-                else:
-                    logger.info(f"Finished playing: {track['title']}")
+                track = queue.popleft()
+                self.track_matcher.discard(guild_id, track)
+                self.currently_playing[guild_id] = track
+                queue_store.pop(guild_id, voice_client.channel.id, track)
+                logger.info(f"Preparing to play: {track.title} (Guild: {guild_id})")
+                
+                # Restored tracks pick up where they were interrupted
+                resume = self.start_positions.pop(guild_id, None)
+                start = resume[1] if resume and resume[0] is track else 0
                 
-                # Schedule next song
-                asyncio.run_coroutine_threadsafe(
-                    self.play_next(guild_id),
-                    asyncio.get_event_loop()
+                resolve_start = time.perf_counter()
+                audio_source = await self._create_source(guild_id, track, start)
+                TRACK_RESOLVE_SECONDS.labels('ok' if audio_source else 'error').observe(
+                    time.perf_counter() - resolve_start
                 )
-            
-            voice_client.play(audio_source, after=after_playing)
-            self.is_playing[guild_id] = True
-            
-            logger.info(f"Now playing: {track['title']} (Guild: {guild_id})")
-            
-        except Exception as error:
-            logger.error(f"Failed to play track: {track['title']} - {error}")
-            logger.info("Attempting to play next track...")
-            self.is_playing[guild_id] = False
-            await self.play_next(guild_id)
+                if audio_source is None:
+                    PLAYBACK_FAILURES.labels('resolve').inc()
+                    logger.info("Skipping to next track...")
+                    continue
+                
+                def after_playing(error, track=track):
+                    if error:
+                        PLAYBACK_FAILURES.labels('ffmpeg').inc()
+                        logger.error(f"Player error: {error}")
+                    else:
+                        logger.info(f"Finished playing: {track.title}")
+                    loop.call_soon_threadsafe(finished.set)
+                
+                finished.clear()
+                try:
+                    voice_client.play(audio_source, after=after_playing)
+                except Exception as error:
+                    PLAYBACK_FAILURES.labels('start').inc()
+                    logger.error(f"Failed to play track: {track.title} - {error}")
+                    audio_source.cleanup()
+                    continue
+                
+                TRACKS_STARTED.inc()
+                requested_at = self.first_audio_requests.pop(guild_id, None)
+                if requested_at is not None:
+                    TIME_TO_FIRST_AUDIO.observe(time.monotonic() - requested_at)
+                
+                self.play_clocks[guild_id] = [start, time.monotonic()]
+                self.touch(guild_id)
+                logger.info(f"Now playing: {track.title} (Guild: {guild_id})")
+                
+                # Resolve upcoming tracks while this one plays
+                self.prefetcher.schedule(guild_id, queue)
+                
+                # Save the position periodically so a crash resumes close to where it stopped
+                while not finished.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            finished.wait(), timeout=config.POSITION_CHECKPOINT_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        self._checkpoint(guild_id)
+        finally:
+            if self.supervisors.get(guild_id) is asyncio.current_task():
+                del self.supervisors[guild_id]
+                self.is_playing[guild_id] = False
+                self.currently_playing.pop(guild_id, None)
+                self.play_clocks.pop(guild_id, None)
+                self.touch(guild_id)
+                if not self.closing:
+                    queue_store.finish(guild_id)
     
     def skip(self, guild_id):
         """Skip the current song"""
@@ -195,6 +402,10 @@ class MusicPlayer:
         
         if voice_client and voice_client.is_playing():
             voice_client.pause()
+            clock = self.play_clocks.get(guild_id)
+            if clock and clock[1] is not None:
+                clock[:] = [self.get_position(guild_id), None]
+                self._checkpoint(guild_id)
             return True
         return False
     
@@ -204,6 +415,9 @@ class MusicPlayer:
         
         if voice_client and voice_client.is_paused():
             voice_client.resume()
+            clock = self.play_clocks.get(guild_id)
+            if clock and clock[1] is None:
+                clock[1] = time.monotonic()
             return True
         return False
     
@@ -213,7 +427,18 @@ class MusicPlayer:
         voice_client = self.voice_clients.get(guild_id)
         
         queue.clear()
+        self.prefetcher.invalidate(guild_id)
+        self.track_matcher.cancel(guild_id)
+        self.load_generations[guild_id] = object()
         self.is_playing[guild_id] = False
+        self.start_positions.pop(guild_id, None)
+        self.play_clocks.pop(guild_id, None)
+        if not self.closing:
+            queue_store.clear(guild_id)
+        
+        supervisor = self.supervisors.pop(guild_id, None)
+        if supervisor:
+            supervisor.cancel()
         
         if guild_id in self.currently_playing:
             del self.currently_playing[guild_id]
@@ -221,15 +446,6 @@ class MusicPlayer:
         if voice_client:
             voice_client.stop()
     
-    def get_current_queue(self, guild_id):
-        """Get the current queue including currently playing song"""
-        queue = self.get_queue(guild_id)
-        current_track = self.currently_playing.get(guild_id)
-        
-        if current_track:
-            return [current_track] + queue
-        return queue
-    
     def get_current_track(self, guild_id):
         """Get the currently playing track"""
         return self.currently_playing.get(guild_id)
@@ -241,6 +457,108 @@ class MusicPlayer:
         if voice_client:
             self.stop(guild_id)
             await voice_client.disconnect()
-            del self.voice_clients[guild_id]
+            self.release(guild_id)
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def touch(self, guild_id):
+        """Mark a guild as active so the idle reaper leaves it alone"""
+        self.last_active[guild_id] = time.monotonic()
+    
+    def release(self, guild_id):
+        """Drop every piece of per-guild state once the guild has no session"""
+        self.prefetcher.forget(guild_id)
+        self.track_matcher.cancel(guild_id)
+        supervisor = self.supervisors.pop(guild_id, None)
+        if supervisor:
+            supervisor.cancel()
+        
+        for state in (
+            self.queues, self.voice_clients, self.currently_playing, self.is_playing,
+            self.load_generations, self.restores, self.start_positions, self.play_clocks,
+            self.last_active, self.empty_since, self.first_audio_requests
+        ):
+            state.pop(guild_id, None)
+        self.disconnected.discard(guild_id)
+    
+    async def abandon(self, guild_id):
+        """Drop a voice session that never came back, keeping its saved queue for a restore"""
+        voice_client = self.voice_clients.get(guild_id)
+        self.release(guild_id)
+        if voice_client:
+            try:
+                await voice_client.disconnect(force=True)
+            except Exception as error:
+                logger.warning(f"Failed to disconnect dead voice client: {error}")
+    
+    def update_listeners(self, guild_id, channel):
+        """Track whether anyone besides bots is left in the bot's voice channel"""
+        if any(not member.bot for member in channel.members):
+            self.empty_since.pop(guild_id, None)
+        else:
+            self.empty_since.setdefault(guild_id, time.monotonic())
+    
+    async def reap_idle(self):
+        """Leave voice channels that are idle or empty and free orphaned guild state"""
+        now = time.monotonic()
+        for guild_id, voice_client in list(self.voice_clients.items()):
+            if not voice_client.is_connected():
+                # Clients report disconnected for the whole of an automatic reconnect,
+                # so only give up on one that is still down at the next sweep
+                if guild_id in self.disconnected:
+                    logger.info(f"Dropping disconnected voice session (Guild: {guild_id})")
+                    await self.abandon(guild_id)
+                else:
+                    self.disconnected.add(guild_id)
+                continue
+            self.disconnected.discard(guild_id)
+            
+            empty_since = self.empty_since.get(guild_id)
+            if empty_since is not None and now - empty_since >= config.EMPTY_CHANNEL_TIMEOUT:
+                reason = 'empty'
+            elif (
+                not voice_client.is_playing()
+                and not self.is_playing.get(guild_id, False)
+                and now - self.last_active.setdefault(guild_id, now) >= config.IDLE_TIMEOUT
+            ):
+                reason = 'idle'
+            else:
+                continue
+            
+            logger.info(f"Leaving {reason} voice channel (Guild: {guild_id})")
+            try:
+                await self.leave(guild_id)
+            except Exception as error:
+                logger.warning(f"Failed to leave {reason} voice channel: {error}")
+                self.release(guild_id)
+            self.reaped[reason] += 1
+        
+        # Guilds that left voice some other way may still hold queues or restore state
+        orphans = (
+            set(self.queues) | set(self.restores) | set(self.load_generations)
+            | set(self.prefetcher.semaphores)
+        )
+        for guild_id in orphans:
+            if guild_id not in self.voice_clients and guild_id not in self.supervisors:
+                self.release(guild_id)
+    
+    def session_stats(self):
+        """Live voice sessions and how many were reaped for being idle or empty"""
+        return {
+            'live': len(self.voice_clients),
+            'playing': sum(1 for playing in self.is_playing.values() if playing),
+            'guild_states': len(self.queues),
+            'reaped_idle': self.reaped['idle'],
+            'reaped_empty': self.reaped['empty']
+        }
+    
+    async def shutdown(self):
+        """Save playback positions and stop playback without touching the saved queues"""
+        self.closing = True
+        for guild_id in list(self.play_clocks):
+            self._checkpoint(guild_id)
+        
+        for supervisor in list(self.supervisors.values()):
+            supervisor.cancel()
+        
+        await queue_store.flush()
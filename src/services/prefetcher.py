@@ -0,0 +1,96 @@
+"""
+Look-ahead prefetcher for resolving upcoming queue entries in the background
+"""
+
+import asyncio
+import itertools
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TrackPrefetcher:
+    """Background resolver that prepares the next few tracks of each guild's queue
+
+    The resolve callback receives the track and whether it is next to play.
+    The next track is resolved urgently, outside the per-guild limit, because
+    it would otherwise be resolved at play time anyway.
+    """
+
+    def __init__(self, resolve, depth=3, concurrency=2):
+        self.resolve = resolve
+        self.depth = depth
+        self.concurrency = concurrency
+        self.tasks = {}
+        self.semaphores = {}
+
+    def get_semaphore(self, guild_id):
+        """Get the concurrency limiter for a guild"""
+        if guild_id not in self.semaphores:
+            self.semaphores[guild_id] = asyncio.Semaphore(self.concurrency)
+        return self.semaphores[guild_id]
+
+    def schedule(self, guild_id, queue):
+        """Start resolving the next tracks in the queue, dropping stale work"""
+        if self.depth <= 0:
+            return
+
+        pending = self.tasks.setdefault(guild_id, {})
+        upcoming = list(itertools.islice(queue, self.depth))
+        wanted = {id(track) for track in upcoming}
+
+        # Cancel work for tracks that are no longer in the look-ahead window
+        for key in list(pending):
+            if key not in wanted:
+                pending.pop(key)[0].cancel()
+
+        for position, track in enumerate(upcoming):
+            key = id(track)
+            urgent = position == 0
+            entry = pending.get(key)
+            if entry and (entry[1] or not urgent or entry[0].done()):
+                continue
+
+            # Restart background work for a track that has become next in line
+            if entry:
+                entry[0].cancel()
+            pending[key] = (asyncio.create_task(self._resolve(guild_id, track, urgent)), urgent)
+
+    async def _resolve(self, guild_id, track, urgent):
+        """Resolve a single track, under the guild's concurrency limit unless urgent"""
+        try:
+            if urgent:
+                await self.resolve(track, True)
+            else:
+                async with self.get_semaphore(guild_id):
+                    await self.resolve(track, False)
+            logger.info(f"Prefetched: {track.title} (Guild: {guild_id})")
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logger.warning(f"Prefetch failed for {track.title}: {error}")
+
+    async def claim(self, guild_id, track):
+        """Take over any in-flight prefetch of a track that is about to play
+
+        Urgent prefetches and ones already extracting the stream are awaited.
+        One still waiting for a rate-limited match is dropped so the caller can
+        match the track at interactive priority instead.
+        """
+        entry = self.tasks.get(guild_id, {}).pop(id(track), None)
+        if entry is None:
+            return
+        task, urgent = entry
+        if urgent or track.url:
+            await asyncio.wait({task})
+        else:
+            task.cancel()
+
+    def invalidate(self, guild_id):
+        """Cancel all look-ahead work for a guild"""
+        for task, _ in self.tasks.pop(guild_id, {}).values():
+            task.cancel()
+
+    def forget(self, guild_id):
+        """Cancel a guild's look-ahead work and drop its concurrency limiter"""
+        self.invalidate(guild_id)
+        self.semaphores.pop(guild_id, None)
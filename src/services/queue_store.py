@@ -0,0 +1,176 @@
+"""
+Queue store for persisting guild queues and playback positions across restarts
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class QueueStore:
+    """SQLite journal of queue mutations and the track each guild is playing
+
+    Every queue change is written as a small row insert or delete instead of
+    a full snapshot. Writes are queued on a single dedicated thread in call
+    order and never awaited, so the player's hot paths stay synchronous.
+    Guild state is only read back when a guild is first touched.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='queue-store')
+        self.connection = None
+
+    def _connect(self):
+        """Open the SQLite store (runs on the store thread)"""
+        if self.connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Cluster processes share the file, so wait on each other's locks
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS queue_tracks ('
+                'guild_id INTEGER NOT NULL, seq INTEGER NOT NULL, track TEXT NOT NULL, '
+                'PRIMARY KEY (guild_id, seq))'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS now_playing ('
+                'guild_id INTEGER PRIMARY KEY, channel_id INTEGER, track TEXT NOT NULL, '
+                'position REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+        return self.connection
+
+    def _submit(self, function, *args):
+        if not self.path:
+            return
+        future = self.executor.submit(function, *args)
+        future.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future):
+        error = future.exception()
+        if error:
+            logger.warning(f"Queue store write failed: {error}")
+
+    def _append(self, guild_id, tracks):
+        connection = self._connect()
+        start = connection.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM queue_tracks WHERE guild_id = ?', (guild_id,)
+        ).fetchone()[0] + 1
+        connection.executemany(
+            'INSERT INTO queue_tracks (guild_id, seq, track) VALUES (?, ?, ?)',
+            [(guild_id, start + index, json.dumps(track)) for index, track in enumerate(tracks)]
+        )
+        connection.commit()
+
+    def _pop(self, guild_id, channel_id, track):
+        connection = self._connect()
+        connection.execute(
+            'DELETE FROM queue_tracks WHERE guild_id = ? AND seq = '
+            '(SELECT MIN(seq) FROM queue_tracks WHERE guild_id = ?)',
+            (guild_id, guild_id)
+        )
+        connection.execute(
+            'INSERT OR REPLACE INTO now_playing (guild_id, channel_id, track, position, updated_at) '
+            'VALUES (?, ?, ?, 0, ?)',
+            (guild_id, channel_id, json.dumps(track), time.time())
+        )
+        connection.commit()
+
+    def _checkpoint(self, guild_id, position):
+        connection = self._connect()
+        connection.execute(
+            'UPDATE now_playing SET position = ?, updated_at = ? WHERE guild_id = ?',
+            (position, time.time(), guild_id)
+        )
+        connection.commit()
+
+    def _finish(self, guild_id):
+        connection = self._connect()
+        connection.execute('DELETE FROM now_playing WHERE guild_id = ?', (guild_id,))
+        connection.commit()
+
+    def _clear(self, guild_id):
+        connection = self._connect()
+        connection.execute('DELETE FROM queue_tracks WHERE guild_id = ?', (guild_id,))
+        connection.execute('DELETE FROM now_playing WHERE guild_id = ?', (guild_id,))
+        connection.commit()
+
+    def _load(self, guild_id):
+        connection = self._connect()
+        tracks = [
+            json.loads(row[0]) for row in connection.execute(
+                'SELECT track FROM queue_tracks WHERE guild_id = ? ORDER BY seq', (guild_id,)
+            )
+        ]
+        row = connection.execute(
+            'SELECT channel_id, track, position FROM now_playing WHERE guild_id = ?', (guild_id,)
+        ).fetchone()
+        if row is None:
+            return None, tracks, 0
+
+        # Put the interrupted track back at the head of the journal so it is popped again
+        channel_id, track, position = row
+        connection.execute(
+            'INSERT INTO queue_tracks (guild_id, seq, track) VALUES (?, '
+            '(SELECT COALESCE(MIN(seq), 1) - 1 FROM queue_tracks WHERE guild_id = ?), ?)',
+            (guild_id, guild_id, track)
+        )
+        connection.execute('DELETE FROM now_playing WHERE guild_id = ?', (guild_id,))
+        connection.commit()
+        return channel_id, [json.loads(track)] + tracks, position
+
+    def append(self, guild_id, tracks):
+        """Record tracks added to the end of a guild's queue"""
+        self._submit(self._append, guild_id, [track.to_dict() for track in tracks])
+
+    def pop(self, guild_id, channel_id, track):
+        """Record the head of the queue starting to play in a voice channel"""
+        self._submit(self._pop, guild_id, channel_id, track.to_dict())
+
+    def checkpoint(self, guild_id, position):
+        """Record how far into the current track playback has got"""
+        self._submit(self._checkpoint, guild_id, position)
+
+    def finish(self, guild_id):
+        """Record that nothing is playing any more"""
+        self._submit(self._finish, guild_id)
+
+    def clear(self, guild_id):
+        """Forget a guild's queue and current track"""
+        self._submit(self._clear, guild_id)
+
+    async def load(self, guild_id):
+        """Load a guild's saved state as (channel_id, track dicts, start position)
+
+        The first track is the one that was playing, if any, and the position
+        is where it should resume.
+        """
+        if not self.path:
+            return None, [], 0
+
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(self.executor, self._load, guild_id)
+        except Exception as error:
+            logger.warning(f"Queue store read failed: {error}")
+            return None, [], 0
+
+    async def flush(self):
+        """Wait for every queued write to reach the database"""
+        if not self.path:
+            return
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self.executor, lambda: None)
+
+# Global queue store instance (the database is opened on first use)
+queue_store = QueueStore(config.QUEUE_STORE_PATH)
@@ -0,0 +1,126 @@
+"""
+Pluggable YouTube search backends
+"""
+
+import time
+from googleapiclient.errors import HttpError
+from src.config import config
+from src.services import extraction_worker
+from src.services.executors import INTERACTIVE, api_pool, extraction_pool
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Data API error reasons that mean the daily quota is used up; rateLimitExceeded
+# is a short-term throttle that clears on its own, so it is not included
+QUOTA_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+
+class QuotaExceededError(Exception):
+    """Raised when a search backend has run out of quota"""
+
+def _error_reasons(error):
+    """The structured reason codes in a Data API HttpError"""
+    details = error.error_details if isinstance(error.error_details, list) else []
+    return {detail.get('reason') for detail in details if isinstance(detail, dict)}
+
+class SearchBackend:
+    """Interface for YouTube search implementations"""
+
+    name = 'base'
+
+    # Whether searches draw on the YouTube Data API daily quota
+    uses_quota = False
+
+    async def search(self, query, max_results=5, priority=INTERACTIVE):
+        """Return a list of video dicts with title, url, thumbnail and author"""
+        raise NotImplementedError
+
+class DataApiSearchBackend(SearchBackend):
+    """Search through the YouTube Data API (100 quota units per call)"""
+
+    name = 'api'
+    uses_quota = True
+
+    def __init__(self, youtube):
+        self.youtube = youtube
+
+    async def search(self, query, max_results=5, priority=INTERACTIVE):
+        try:
+            response = await api_pool.run(
+                self.youtube.search().list(
+                    part='snippet',
+                    q=query,
+                    type='video',
+                    maxResults=max_results,
+                    order='relevance',
+                    fields='items(id/videoId,snippet(title,channelTitle,thumbnails/default/url))'
+                ).execute,
+                priority=priority
+            )
+        except HttpError as error:
+            if error.resp.status == 403 and _error_reasons(error) & set(QUOTA_REASONS):
+                raise QuotaExceededError("YouTube Data API quota exceeded")
+            raise
+
+        return [
+            {
+                'title': item['snippet']['title'],
+                'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+                'thumbnail': item['snippet'].get('thumbnails', {}).get('default', {}).get('url'),
+                'author': item['snippet']['channelTitle']
+            }
+            for item in response.get('items', [])
+        ]
+
+class YtDlpSearchBackend(SearchBackend):
+    """API-key-free search through yt-dlp's ytsearchN: flat extraction"""
+
+    name = 'ytdlp'
+
+    async def search(self, query, max_results=5, priority=INTERACTIVE):
+        return await extraction_pool.run(
+            extraction_worker.search, query, max_results, priority=priority
+        )
+
+class FallbackSearchBackend(SearchBackend):
+    """Use a primary backend and switch to a fallback while its quota is exhausted"""
+
+    def __init__(self, primary, fallback, cooldown):
+        self.primary = primary
+        self.fallback = fallback
+        self.cooldown = cooldown
+        self.exhausted_until = 0
+        self.name = f"{primary.name}+{fallback.name}"
+        self.uses_quota = primary.uses_quota
+
+    async def search(self, query, max_results=5, priority=INTERACTIVE):
+        if time.monotonic() >= self.exhausted_until:
+            try:
+                return await self.primary.search(query, max_results, priority)
+            except QuotaExceededError:
+                logger.warning(
+                    f"{self.primary.name} search quota exhausted, "
+                    f"using {self.fallback.name} for {self.cooldown}s"
+                )
+                self.exhausted_until = time.monotonic() + self.cooldown
+
+        return await self.fallback.search(query, max_results, priority)
+
+def create_search_backend(youtube=None):
+    """Create the search backend selected by SEARCH_BACKEND"""
+    choice = config.SEARCH_BACKEND
+
+    if choice == 'ytdlp' or (choice == 'auto' and youtube is None):
+        return YtDlpSearchBackend()
+
+    if youtube is None:
+        raise Exception("SEARCH_BACKEND=api requires YOUTUBE_API_KEY to be set")
+
+    if choice == 'api':
+        return DataApiSearchBackend(youtube)
+
+    return FallbackSearchBackend(
+        DataApiSearchBackend(youtube),
+        YtDlpSearchBackend(),
+        config.SEARCH_QUOTA_COOLDOWN
+    )
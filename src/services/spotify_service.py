@@ -4,16 +4,56 @@ Spotify service for handling Spotify playlist integration
 
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
+import asyncio
+import itertools
 import logging
+import time
+from collections import deque
 from src.config import config
+from src.services.executors import BACKGROUND, INTERACTIVE, api_pool
 from src.utils.logger import get_logger
+from src.utils.metrics import Histogram
+from src.utils.single_flight import SingleFlight
+from src.utils.url_router import SPOTIFY_ALBUM, SPOTIFY_ARTIST, SPOTIFY_PLAYLIST, SPOTIFY_TRACK
 
 logger = get_logger(__name__)
 
+API_CALL_SECONDS = Histogram(
+    'musicbot_spotify_api_seconds', 'Spotify Web API call latency', ['method', 'outcome']
+)
+
+# Spotify returns at most 100 playlist items per page
+PLAYLIST_PAGE_SIZE = 100
+
+# Album track pages hold at most 50 tracks
+ALBUM_PAGE_SIZE = 50
+
+# Pages after the first downloaded ahead of the consumer, per playlist or album
+PAGE_PREFETCH = 2
+
+# The batch endpoints accept at most 50 track IDs or 20 album IDs per call
+TRACKS_BATCH_SIZE = 50
+ALBUMS_BATCH_SIZE = 20
+
+# Only request the fields needed to build queue tracks
+TRACK_FIELDS = 'items(track(id,name,duration_ms,artists(name)))'
+PLAYLIST_FIELDS = f'name,tracks(total,{TRACK_FIELDS})'
+
+def _freeze(value):
+    """Make call arguments hashable so identical calls share a request key"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
 class SpotifyService:
     """Spotify service for playlist integration"""
     
     def __init__(self):
+        # Guilds pasting the same links at once share one API call
+        self.requests = SingleFlight('spotify')
+        
         if not config.SPOTIFY_CLIENT_ID or not config.SPOTIFY_CLIENT_SECRET:
             logger.warning("Spotify credentials not configured. Spotify support disabled.")
             self.enabled = False
@@ -44,52 +84,215 @@ class SpotifyService:
             logger.warning("Spotify features will be disabled. YouTube search will still work.")
             self.enabled = False
     
-    def is_spotify_url(self, url):
-        """Check if URL is a Spotify playlist URL"""
-        return 'spotify.com/playlist/' in url or 'open.spotify.com/playlist/' in url
+    async def _call(self, method, *args, priority=INTERACTIVE, **kwargs):
+        """Run a blocking spotipy call in the shared API pool, joining an identical call in flight"""
+        key = (method.__name__, _freeze(args), _freeze(kwargs))
+        return await self.requests.do(
+            key, lambda: self._request(method, *args, priority=priority, **kwargs), priority
+        )
+    
+    async def _request(self, method, *args, priority=INTERACTIVE, **kwargs):
+        """Run a blocking spotipy call, recording its latency"""
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            response = await api_pool.run(method, *args, priority=priority, **kwargs)
+            outcome = 'ok'
+            return response
+        finally:
+            API_CALL_SECONDS.labels(method.__name__, outcome).observe(time.perf_counter() - start)
+    
+    def _parse_track(self, track):
+        """Build a queue track from a Spotify track object, or None if it is unusable"""
+        if not track or not track.get('name') or not track.get('artists'):
+            return None
+        
+        artists = ', '.join([artist['name'] for artist in track['artists']])
+        return {
+            'title': track['name'],
+            'artist': artists,
+            'duration': track['duration_ms'] // 1000,
+            'duration_ms': track['duration_ms'],
+            'search_query': f"{track['name']} {track['artists'][0]['name']}",
+            'spotify_id': track.get('id')
+        }
     
-    def extract_playlist_id(self, url):
-        """Extract playlist ID from Spotify URL"""
-        import re
-        match = re.search(r'playlist/([a-zA-Z0-9]+)', url)
-        return match.group(1) if match else None
+    def _parse_tracks(self, tracks):
+        """Build queue tracks from a list of Spotify track objects"""
+        return [parsed for parsed in map(self._parse_track, tracks) if parsed]
     
-    async def get_playlist_tracks(self, playlist_id):
-        """Get tracks from a Spotify playlist"""
+    def _parse_playlist_items(self, items):
+        """Build queue tracks from a page of playlist items"""
+        return self._parse_tracks(item.get('track') for item in items)
+    
+    async def _iter_pages(self, first_page, fetch_page, offsets):
+        """Yield pages of tracks in order while the next few download in the background"""
+        yield first_page
+        
+        # A small window keeps one huge playlist from flooding the shared API pool
+        offsets = iter(offsets)
+        pages = deque()
+        try:
+            while True:
+                for offset in itertools.islice(offsets, PAGE_PREFETCH - len(pages)):
+                    pages.append(asyncio.ensure_future(fetch_page(offset)))
+                if not pages:
+                    break
+                page = await pages[0]
+                pages.popleft()
+                yield page
+        finally:
+            for page in pages:
+                page.cancel()
+    
+    async def _fetch_playlist_page(self, playlist_id, offset):
+        page = await self._call(
+            self.spotify.playlist_items,
+            playlist_id,
+            fields=TRACK_FIELDS,
+            limit=PLAYLIST_PAGE_SIZE,
+            offset=offset,
+            additional_types=('track',),
+            priority=BACKGROUND
+        )
+        return self._parse_playlist_items(page['items'])
+    
+    async def _fetch_album_page(self, album_id, offset):
+        page = await self._call(
+            self.spotify.album_tracks, album_id, limit=ALBUM_PAGE_SIZE, offset=offset,
+            priority=BACKGROUND
+        )
+        return self._parse_tracks(page['items'])
+    
+    async def _fetch_batched(self, method, ids, batch_size, key):
+        """Look up IDs through a batch endpoint, returning {id: object} for the ones found"""
+        unique = list(dict.fromkeys(ids))
+        batches = [unique[start:start + batch_size] for start in range(0, len(unique), batch_size)]
+        responses = await asyncio.gather(*[self._call(method, batch) for batch in batches])
+        
+        # Results come back in request order, with None for unknown IDs
+        found = {}
+        for batch, response in zip(batches, responses):
+            for item_id, item in zip(batch, response[key]):
+                if item:
+                    found[item_id] = item
+        return found
+    
+    async def _fetch_top_tracks(self, artist_ids):
+        """Get {artist_id: (name, tracks)}; there is no batch endpoint for top tracks"""
+        unique = list(dict.fromkeys(artist_ids))
+        responses = await asyncio.gather(*[
+            self._call(self.spotify.artist_top_tracks, artist_id) for artist_id in unique
+        ])
+        
+        top_tracks = {}
+        for artist_id, response in zip(unique, responses):
+            tracks = response['tracks']
+            # Name the artist from their own credit on one of the tracks
+            name = next((
+                artist['name'] for track in tracks for artist in track['artists']
+                if artist['id'] == artist_id
+            ), 'this artist')
+            top_tracks[artist_id] = (name, tracks)
+        return top_tracks
+    
+    async def open_playlist(self, playlist_id):
+        """Get a Spotify playlist whose tracks arrive as an async iterator of pages"""
         if not self.enabled:
             raise Exception("Spotify service is not enabled")
         
         try:
-            # Get playlist info
-            playlist = self.spotify.playlist(playlist_id)
-            tracks = []
-            
-            # Get all tracks (handle pagination)
-            results = self.spotify.playlist_tracks(playlist_id)
-            
-            while results:
-                for item in results['items']:
-                    if item['track'] and item['track']['name']:
-                        track = item['track']
-                        artists = ', '.join([artist['name'] for artist in track['artists']])
-                        
-                        tracks.append({
-                            'title': track['name'],
-                            'artist': artists,
-                            'duration': track['duration_ms'],
-                            'search_query': f"{track['name']} {track['artists'][0]['name']}"
-                        })
-                
-                # Get next page if available
-                results = self.spotify.next(results) if results['next'] else None
-            
-            logger.info(f"Found {len(tracks)} tracks in Spotify playlist: {playlist['name']}")
-            
-            return {
-                'name': playlist['name'],
-                'tracks': tracks
-            }
-            
+            # The first request returns the playlist name, total and first page of tracks
+            playlist = await self._call(
+                self.spotify.playlist, playlist_id, fields=PLAYLIST_FIELDS
+            )
         except Exception as error:
             logger.error(f"Failed to fetch Spotify playlist: {error}")
-            raise Exception("Failed to fetch Spotify playlist")
\ No newline at end of file
+            raise Exception("Failed to fetch Spotify playlist")
+        
+        return {
+            'name': playlist['name'],
+            'tracks': self._iter_pages(
+                self._parse_playlist_items(playlist['tracks']['items']),
+                lambda offset: self._fetch_playlist_page(playlist_id, offset),
+                range(PLAYLIST_PAGE_SIZE, playlist['tracks']['total'], PLAYLIST_PAGE_SIZE)
+            )
+        }
+    
+    async def open_links(self, routes):
+        """Get the tracks of Spotify playlist, album, track and artist links as one playlist
+        
+        Track and album links are resolved together through the batch
+        endpoints, so pasting several of them costs one call per batch.
+        Tracks arrive as an async iterator of pages in link order.
+        """
+        if not self.enabled:
+            raise Exception("Spotify service is not enabled")
+        
+        def ids(kind):
+            return [route.spotify_id for route in routes if route.kind == kind]
+        
+        try:
+            tracks, albums, top_tracks, playlists = await asyncio.gather(
+                self._fetch_batched(self.spotify.tracks, ids(SPOTIFY_TRACK), TRACKS_BATCH_SIZE, 'tracks'),
+                self._fetch_batched(self.spotify.albums, ids(SPOTIFY_ALBUM), ALBUMS_BATCH_SIZE, 'albums'),
+                self._fetch_top_tracks(ids(SPOTIFY_ARTIST)),
+                asyncio.gather(*[self.open_playlist(playlist_id) for playlist_id in ids(SPOTIFY_PLAYLIST)])
+            )
+        except Exception as error:
+            logger.error(f"Failed to fetch Spotify links: {error}")
+            raise Exception("Failed to fetch Spotify links")
+        
+        names = []
+        sources = []
+        playlists = iter(playlists)
+        for route in routes:
+            if route.kind == SPOTIFY_PLAYLIST:
+                playlist = next(playlists)
+                names.append(playlist['name'])
+                sources.append(playlist['tracks'])
+            elif route.kind == SPOTIFY_ALBUM and route.spotify_id in albums:
+                album = albums[route.spotify_id]
+                names.append(album['name'])
+                sources.append(self._iter_pages(
+                    self._parse_tracks(album['tracks']['items']),
+                    lambda offset, album_id=album['id']: self._fetch_album_page(album_id, offset),
+                    range(len(album['tracks']['items']), album['tracks']['total'], ALBUM_PAGE_SIZE)
+                ))
+            elif route.kind == SPOTIFY_TRACK and route.spotify_id in tracks:
+                track = tracks[route.spotify_id]
+                names.append(track['name'])
+                sources.append(self._parse_tracks([track]))
+            elif route.kind == SPOTIFY_ARTIST and route.spotify_id in top_tracks:
+                name, artist_tracks = top_tracks[route.spotify_id]
+                names.append(f"Top tracks by {name}")
+                sources.append(self._parse_tracks(artist_tracks))
+        
+        if not sources:
+            raise Exception("None of those Spotify links could be found")
+        
+        return {
+            'name': names[0] if len(names) == 1 else f"{len(names)} Spotify links",
+            'tracks': self._iter_link_pages(sources)
+        }
+    
+    async def _iter_link_pages(self, sources):
+        """Yield pages from each link in order, merging consecutive single lists into one page"""
+        pending = []
+        for source in sources:
+            if isinstance(source, list):
+                pending.extend(source)
+                continue
+            
+            if pending:
+                yield pending
+                pending = []
+            # Close the source if the consumer stops early so its prefetches are cancelled
+            try:
+                async for page in source:
+                    yield page
+            finally:
+                await source.aclose()
+        
+        if pending:
+            yield pending
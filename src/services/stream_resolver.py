@@ -0,0 +1,83 @@
+"""
+Stream resolver service for turning YouTube URLs into direct audio stream URLs
+"""
+
+import time
+from urllib.parse import urlparse, parse_qs
+from src.config import config
+from src.services.executors import INTERACTIVE
+from src.utils.cache import TTLCache
+from src.utils.logger import get_logger
+from src.utils.url_router import extract_video_id
+
+logger = get_logger(__name__)
+
+# Used when a stream URL carries no expire= parameter
+DEFAULT_STREAM_TTL = 3600
+
+class StreamResolver:
+    """Resolves YouTube videos to bestaudio stream URLs and caches them until they expire"""
+
+    def __init__(self, youtube_service):
+        self.youtube_service = youtube_service
+        self.expiry_margin = config.STREAM_EXPIRY_MARGIN
+        self.cache = TTLCache(
+            max_entries=config.STREAM_CACHE_SIZE,
+            default_ttl=DEFAULT_STREAM_TTL
+        )
+
+    def cache_key(self, url):
+        """Get the cache key for a video URL"""
+        return extract_video_id(url) or url
+
+    def parse_expiry(self, stream_url):
+        """Parse the expiry timestamp from a stream URL's expire= parameter"""
+        values = parse_qs(urlparse(stream_url).query).get('expire')
+        try:
+            return float(values[0]) if values else None
+        except ValueError:
+            return None
+
+    def stream_from_info(self, info):
+        """Build a stream entry from a summarized yt-dlp info dict"""
+        stream_url = info.get('url')
+        if not stream_url:
+            return None
+
+        expires_at = self.parse_expiry(stream_url)
+        if expires_at is None:
+            expires_at = time.time() + DEFAULT_STREAM_TTL
+
+        return {
+            'url': stream_url,
+            'expires_at': expires_at,
+            'acodec': info.get('acodec')
+        }
+
+    def store(self, url, stream):
+        """Cache a stream entry until shortly before it expires"""
+        ttl = stream['expires_at'] - time.time() - self.expiry_margin
+        self.cache.set(self.cache_key(url), stream, ttl)
+
+    async def extract(self, url, priority=INTERACTIVE):
+        """Extract a video once, caching its stream and returning the full info"""
+        info = await self.youtube_service.extract_info(url, priority=priority)
+
+        stream = self.stream_from_info(info)
+        if stream:
+            self.store(url, stream)
+        return info
+
+    async def resolve(self, url, priority=INTERACTIVE):
+        """Get a direct audio stream URL for a YouTube video"""
+        stream = self.cache.get(self.cache_key(url))
+        if stream:
+            return stream
+
+        logger.info(f"Resolving audio stream for: {url}")
+
+        info = await self.extract(url, priority=priority)
+        stream = self.stream_from_info(info)
+        if not stream:
+            raise Exception("No audio stream available")
+        return stream
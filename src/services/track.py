@@ -0,0 +1,76 @@
+"""
+Compact track representation for queue entries
+"""
+
+import sys
+
+def _intern(value):
+    """Intern strings that repeat across many queue entries"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Track:
+    """Queue entry holding only the fields playback and display need"""
+
+    __slots__ = (
+        'title',
+        'url',
+        'author',
+        'thumbnail',
+        'duration',
+        'search_query',
+        'artist',
+        'spotify_id',
+        'requested_by',
+        'added_at',
+        'is_playlist'
+    )
+
+    def __init__(self, title, url=None, author=None, thumbnail=None, duration=0,
+                 search_query=None, artist=None, spotify_id=None, requested_by=None,
+                 added_at=0.0, is_playlist=False):
+        self.title = title
+        self.url = url
+        self.author = _intern(author)
+        self.thumbnail = thumbnail
+        self.duration = duration or 0
+        self.search_query = search_query
+        self.artist = _intern(artist)
+        self.spotify_id = spotify_id
+        self.requested_by = requested_by
+        self.added_at = added_at
+        self.is_playlist = is_playlist
+
+    @classmethod
+    def from_dict(cls, data, requested_by=None, added_at=0.0, is_playlist=False):
+        """Build a track from a service result dict, dropping unused fields"""
+        return cls(
+            title=data.get('title', 'Unknown'),
+            url=data.get('url'),
+            author=data.get('author'),
+            thumbnail=data.get('thumbnail'),
+            duration=data.get('duration'),
+            search_query=data.get('search_query'),
+            artist=data.get('artist'),
+            spotify_id=data.get('spotify_id'),
+            requested_by=requested_by,
+            added_at=added_at,
+            is_playlist=is_playlist
+        )
+
+    def to_dict(self):
+        """Serialize the track for persistence (added_at is process-local and dropped)"""
+        return {
+            'title': self.title,
+            'url': self.url,
+            'author': self.author,
+            'thumbnail': self.thumbnail,
+            'duration': self.duration,
+            'search_query': self.search_query,
+            'artist': self.artist,
+            'spotify_id': self.spotify_id,
+            'requested_by': self.requested_by,
+            'is_playlist': self.is_playlist
+        }
+
+    def __repr__(self):
+        return f"<Track title={self.title!r} url={self.url!r}>"
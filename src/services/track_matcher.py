@@ -0,0 +1,214 @@
+"""
+Track matcher service for resolving Spotify tracks to YouTube videos in bulk
+"""
+
+import asyncio
+from collections import deque
+from src.config import config
+from src.services.executors import BACKGROUND, INTERACTIVE
+from src.utils.cache import metadata_cache
+from src.utils.logger import get_logger
+from src.utils.url_router import extract_video_id
+from src.utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
+
+# Search results compared by duration for each Spotify track
+MATCH_CANDIDATES = 5
+
+# Data API quota units per match: search().list plus videos().list for durations
+MATCH_QUOTA_COST = 101
+
+class TrackMatcher:
+    """Matches Spotify tracks to YouTube videos concurrently under a search rate limit"""
+
+    def __init__(self, youtube_service):
+        self.youtube_service = youtube_service
+        # A rate of 0 leaves background yt-dlp searches bounded only by MATCH_CONCURRENCY
+        self.rate_limiter = TokenBucket(
+            config.MATCH_SEARCH_RATE, config.MATCH_SEARCH_BURST
+        ) if config.MATCH_SEARCH_RATE > 0 else None
+        # Data API searches are paced so background matching spends at most its daily budget
+        self.quota_limiter = TokenBucket(
+            config.MATCH_DAILY_QUOTA_UNITS / 86400 / MATCH_QUOTA_COST, config.MATCH_SEARCH_BURST
+        ) if config.MATCH_DAILY_QUOTA_UNITS > 0 else None
+        self.semaphore = asyncio.Semaphore(config.MATCH_CONCURRENCY)
+        self.pending = {}
+        # Per guild: tracks waiting for a background match in queue order, the IDs of
+        # those still wanted, and the single worker draining them
+        self.backlogs = {}
+        self.wanted = {}
+        self.workers = {}
+
+    def pick_best(self, track, candidates, durations):
+        """Pick the candidate whose duration is closest to the Spotify track's"""
+        if not track.duration or not durations:
+            return candidates[0]
+
+        def score(indexed):
+            position, candidate = indexed
+            video_id = extract_video_id(candidate['url'])
+            duration = durations.get(video_id)
+            if duration is None:
+                return (float('inf'), position)
+            # Prefer the closest duration, then the search ranking
+            return (abs(duration - track.duration), position)
+
+        return min(enumerate(candidates), key=score)[1]
+
+    async def _search(self, track, priority):
+        """Search YouTube for a track and return the best matching URL"""
+        candidates = await self.youtube_service.search_videos(
+            track.search_query, MATCH_CANDIDATES, priority=priority
+        )
+        if not candidates:
+            logger.error(f"No YouTube results found for: {track.search_query}")
+            return None
+
+        # yt-dlp search results already carry durations; Data API results need a lookup
+        durations = {
+            extract_video_id(video['url']): video['duration']
+            for video in candidates if video.get('duration')
+        }
+        missing = [
+            extract_video_id(video['url'])
+            for video in candidates if not video.get('duration')
+        ]
+        if missing and track.duration:
+            try:
+                durations.update(
+                    await self.youtube_service.get_video_durations(missing, priority=priority)
+                )
+            except Exception as error:
+                logger.warning(f"Could not fetch durations for matching: {error}")
+
+        return self.pick_best(track, candidates, durations)['url']
+
+    async def _known_url(self, track):
+        """The URL a track was already matched to, if any"""
+        if track.url:
+            return track.url
+        if track.spotify_id:
+            return await metadata_cache.get('spotify_match', track.spotify_id)
+        return None
+
+    async def _match(self, track, priority):
+        cached_url = await self._known_url(track)
+        if cached_url:
+            return cached_url
+
+        # Playback of the next song is never held back by the background budget.
+        # Tokens are taken before a search slot so throttled work never holds one.
+        if priority != INTERACTIVE:
+            if not self.youtube_service.search_backend.uses_quota:
+                limiter = self.rate_limiter
+            elif self.quota_limiter:
+                limiter = self.quota_limiter
+            else:
+                # No background quota: the track is matched when it comes up to play
+                return None
+
+            if limiter:
+                await limiter.acquire()
+
+                # The track may have been matched for playback while this waited for a token
+                cached_url = await self._known_url(track)
+                if cached_url:
+                    limiter.refund()
+                    return cached_url
+
+        async with self.semaphore:
+            url = await self._search(track, priority)
+
+        if url and track.spotify_id:
+            await metadata_cache.set(
+                'spotify_match', track.spotify_id, url, config.SPOTIFY_MATCH_CACHE_TTL
+            )
+        return url
+
+    def _forget(self, key, task):
+        entry = self.pending.get(key)
+        if entry and entry[0] is task:
+            del self.pending[key]
+
+    async def match(self, track, priority=INTERACTIVE):
+        """Resolve a track to a YouTube URL, joining any match already in flight"""
+        if track.url or not track.search_query:
+            return track.url
+
+        key = id(track)
+        entry = self.pending.get(key)
+
+        # Interactive callers don't wait behind a rate-limited background match
+        if entry is None or priority < entry[2]:
+            task = asyncio.ensure_future(self._match(track, priority))
+            entry = self.pending[key] = [task, 0, priority]
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # Count waiters so the search is only cancelled when nobody needs it any more
+        task = entry[0]
+        entry[1] += 1
+        try:
+            url = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            entry[1] -= 1
+            if entry[1] == 0:
+                task.cancel()
+            raise
+        entry[1] -= 1
+
+        if url:
+            track.url = url
+            logger.info(f"Matched {track.title} to {url}")
+        return track.url
+
+    async def _work(self, guild_id):
+        """Match a guild's backlog one track at a time under the background limits"""
+        backlog = self.backlogs[guild_id]
+        wanted = self.wanted[guild_id]
+        try:
+            while backlog:
+                track = backlog.popleft()
+                # Tracks that were played or removed are no longer wanted
+                if id(track) not in wanted:
+                    continue
+                wanted.discard(id(track))
+                if track.url:
+                    continue
+
+                try:
+                    await self.match(track, BACKGROUND)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as error:
+                    logger.warning(f"Track matching failed: {error}")
+        finally:
+            if self.workers.get(guild_id) is asyncio.current_task():
+                del self.workers[guild_id]
+                self.backlogs.pop(guild_id, None)
+                self.wanted.pop(guild_id, None)
+
+    def schedule(self, guild_id, tracks):
+        """Queue tracks to be matched in the background"""
+        unmatched = [track for track in tracks if not track.url and track.search_query]
+        if not unmatched:
+            return
+
+        self.backlogs.setdefault(guild_id, deque()).extend(unmatched)
+        self.wanted.setdefault(guild_id, set()).update(id(track) for track in unmatched)
+        if guild_id not in self.workers:
+            self.workers[guild_id] = asyncio.create_task(self._work(guild_id))
+
+    def discard(self, guild_id, track):
+        """Stop waiting to match a track, e.g. because it is about to play"""
+        wanted = self.wanted.get(guild_id)
+        if wanted is not None:
+            wanted.discard(id(track))
+
+    def cancel(self, guild_id):
+        """Cancel background matching for a guild"""
+        worker = self.workers.pop(guild_id, None)
+        if worker:
+            worker.cancel()
+        self.backlogs.pop(guild_id, None)
+        self.wanted.pop(guild_id, None)
@@ -5,12 +5,50 @@ YouTube service for handling YouTube video and playlist integration
 import yt_dlp
 import asyncio
 import logging
+import re
+import time
 from googleapiclient.discovery import build
 from src.config import config
+from src.services.executors import INTERACTIVE, api_pool, extraction_pool
+from src.services.extraction_worker import YTDL_OPTIONS, extract, summarize_info
+from src.services.search_backends import create_search_backend
+from src.utils.cache import metadata_cache, normalize_query
 from src.utils.logger import get_logger
+from src.utils.metrics import Counter, Histogram
+from src.utils.single_flight import SingleFlight
+from src.utils.url_router import extract_video_id
 
 logger = get_logger(__name__)
 
+API_CALL_SECONDS = Histogram(
+    'musicbot_youtube_api_seconds', 'YouTube Data API call latency', ['method', 'outcome']
+)
+SEARCH_SECONDS = Histogram(
+    'musicbot_search_seconds', 'YouTube search latency on cache misses', ['backend', 'outcome']
+)
+SEARCH_LOOKUPS = Counter(
+    'musicbot_search_lookups_total', 'YouTube searches by metadata cache outcome', ['cache']
+)
+EXTRACT_SECONDS = Histogram(
+    'musicbot_ytdlp_extract_seconds', 'yt-dlp extraction latency', ['backend', 'outcome']
+)
+
+# ISO 8601 durations returned by videos().list, e.g. PT1H2M3S
+ISO_DURATION_PATTERN = re.compile(r'P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+# videos().list accepts at most 50 IDs per call
+VIDEOS_BATCH_SIZE = 50
+
+# The Data API returns at most 50 playlist items per page
+PLAYLIST_PAGE_SIZE = 50
+
+# Only request the fields needed to build queue tracks
+PLAYLIST_ITEM_FIELDS = (
+    'nextPageToken,'
+    'items(snippet(title,channelTitle,videoOwnerChannelTitle,'
+    'resourceId/videoId,thumbnails/default/url))'
+)
+
 class YouTubeService:
     """YouTube service for video and playlist integration"""
     
@@ -21,198 +59,250 @@ class YouTubeService:
             self.api_enabled = True
             logger.info("YouTube Data API initialized")
         else:
+            self.youtube = None
             self.api_enabled = False
-            logger.warning("YouTube API key not provided. Search and playlist features disabled.")
+            logger.warning("YouTube API key not provided. Playlist features disabled, searching through yt-dlp.")
+        
+        self.search_backend = create_search_backend(self.youtube)
+        logger.info(f"YouTube search backend: {self.search_backend.name}")
         
         # yt-dlp options
-        self.ytdl_format_options = {
-            'format': 'bestaudio/best',
-            'outtmpl': '%(extractor)s-%(id)s-%(title)s.%(ext)s',
-            'restrictfilenames': True,
-            'noplaylist': True,
-            'nocheckcertificate': True,
-            'ignoreerrors': False,
-            'logtostderr': False,
-            'quiet': True,
-            'no_warnings': True,
-            'default_search': 'auto',
-            'source_address': '0.0.0.0'
-        }
+        self.ytdl_format_options = dict(YTDL_OPTIONS)
         
         self.ytdl = yt_dlp.YoutubeDL(self.ytdl_format_options)
-    
-    def is_youtube_playlist_url(self, url):
-        """Check if URL is a YouTube playlist URL"""
-        return 'youtube.com/playlist' in url or 'music.youtube.com/playlist' in url
-    
-    def is_youtube_video_url(self, url):
-        """Check if URL is a YouTube video URL"""
-        try:
-            # Extract info to validate
-            info = self.ytdl.extract_info(url, download=False)
-            return info is not None
-        except:
-            return False
-    
-    def extract_video_id(self, url):
-        """Extract video ID from YouTube URL"""
-        import re
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/v\/([a-zA-Z0-9_-]{11})',
-            r'music\.youtube\.com\/watch\?v=([a-zA-Z0-9_-]{11})'
-        ]
         
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
-    
-    def extract_playlist_id(self, url):
-        """Extract playlist ID from YouTube URL"""
-        import re
-        match = re.search(r'[?&]list=([a-zA-Z0-9_-]+)', url)
-        return match.group(1) if match else None
-    
-    async def search_videos(self, query, max_results=5):
+        # Guilds pasting the same song or playlist at once share one lookup
+        self.searches = SingleFlight('search')
+        self.extractions = SingleFlight('extract')
+        self.playlist_requests = SingleFlight('youtube_playlist')
+    
+    async def search_videos(self, query, max_results=5, priority=INTERACTIVE):
         """Search for videos on YouTube"""
-        if not self.api_enabled:
-            raise Exception("YouTube API key not configured. Please add YOUTUBE_API_KEY to your .env file.")
+        cache_key = f"{normalize_query(query)}|{max_results}"
+        cached = await metadata_cache.get('search', cache_key)
+        if cached is not None:
+            SEARCH_LOOKUPS.labels('hit').inc()
+            return cached
+        SEARCH_LOOKUPS.labels('miss').inc()
         
+        return await self.searches.do(
+            cache_key, lambda: self._search(query, max_results, cache_key, priority), priority
+        )
+    
+    async def _search(self, query, max_results, cache_key, priority):
+        """Search through the backend and cache the results"""
+        start = time.perf_counter()
         try:
             logger.info(f"Searching YouTube for: {query}")
             
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.youtube.search().list(
-                    part='snippet',
-                    q=query,
-                    type='video',
-                    maxResults=max_results,
-                    order='relevance'
-                ).execute()
-            )
-            
-            videos = []
-            for item in response['items']:
-                videos.append({
-                    'title': item['snippet']['title'],
-                    'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                    'thumbnail': item['snippet']['thumbnails'].get('default', {}).get('url'),
-                    'author': item['snippet']['channelTitle'],
-                    'description': item['snippet']['description']
-                })
+            videos = await self.search_backend.search(query, max_results, priority=priority)
+            SEARCH_SECONDS.labels(self.search_backend.name, 'ok').observe(time.perf_counter() - start)
             
             logger.info(f"Found {len(videos)} videos for query: {query}")
+            
+            if videos:
+                await metadata_cache.set('search', cache_key, videos, config.SEARCH_CACHE_TTL)
             return videos
             
         except Exception as error:
+            SEARCH_SECONDS.labels(self.search_backend.name, 'error').observe(time.perf_counter() - start)
             logger.error(f"YouTube search failed: {error}")
             raise Exception(f"YouTube search failed: {error}")
     
-    async def get_playlist_videos(self, playlist_id):
-        """Get videos from a YouTube playlist"""
+    async def _api(self, method, request, priority=INTERACTIVE):
+        """Execute a Data API request in the shared API pool, recording its latency"""
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            response = await api_pool.run(request.execute, priority=priority)
+            outcome = 'ok'
+            return response
+        finally:
+            API_CALL_SECONDS.labels(method, outcome).observe(time.perf_counter() - start)
+    
+    def parse_duration(self, value):
+        """Convert an ISO 8601 duration into seconds"""
+        match = ISO_DURATION_PATTERN.fullmatch(value or '')
+        if not match:
+            return None
+        days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+    
+    async def get_video_durations(self, video_ids, priority=INTERACTIVE):
+        """Get durations in seconds for many videos using batched videos().list calls"""
         if not self.api_enabled:
-            raise Exception("YouTube API key not configured. Please add YOUTUBE_API_KEY to your .env file.")
+            return {}
         
-        try:
-            logger.info(f"Fetching YouTube playlist: {playlist_id}")
-            
-            loop = asyncio.get_event_loop()
+        video_ids = [video_id for video_id in dict.fromkeys(video_ids) if video_id]
+        batches = [
+            video_ids[start:start + VIDEOS_BATCH_SIZE]
+            for start in range(0, len(video_ids), VIDEOS_BATCH_SIZE)
+        ]
+        
+        responses = await asyncio.gather(*[
+            self._api(
+                'videos.list',
+                self.youtube.videos().list(
+                    part='contentDetails',
+                    id=','.join(batch),
+                    maxResults=VIDEOS_BATCH_SIZE,
+                    fields='items(id,contentDetails/duration)'
+                ),
+                priority=priority
+            )
+            for batch in batches
+        ])
+        
+        durations = {}
+        for response in responses:
+            for item in response.get('items', []):
+                durations[item['id']] = self.parse_duration(item['contentDetails']['duration'])
+        return durations
+    
+    def _parse_playlist_items(self, response):
+        """Build queue tracks from a page of playlist items"""
+        videos = []
+        for item in response.get('items', []):
+            snippet = item['snippet']
+            if snippet['title'] in ('Private video', 'Deleted video'):
+                continue
             
-            # Get playlist info
-            playlist_response = await loop.run_in_executor(
-                None,
-                lambda: self.youtube.playlists().list(
+            videos.append({
+                'title': snippet['title'],
+                'url': f"https://www.youtube.com/watch?v={snippet['resourceId']['videoId']}",
+                'thumbnail': snippet.get('thumbnails', {}).get('default', {}).get('url'),
+                'author': snippet.get('videoOwnerChannelTitle', snippet.get('channelTitle'))
+            })
+        return videos
+    
+    async def _fetch_playlist_page(self, playlist_id, page_token):
+        """Fetch one trimmed page of playlist items"""
+        return await self.playlist_requests.do(
+            ('page', playlist_id, page_token),
+            lambda: self._api(
+                'playlistItems.list',
+                self.youtube.playlistItems().list(
                     part='snippet',
-                    id=playlist_id
-                ).execute()
+                    playlistId=playlist_id,
+                    maxResults=PLAYLIST_PAGE_SIZE,
+                    pageToken=page_token,
+                    fields=PLAYLIST_ITEM_FIELDS
+                )
             )
-            
-            if not playlist_response['items']:
-                raise Exception("Playlist not found or is private")
-            
-            playlist_info = playlist_response['items'][0]
-            videos = []
-            next_page_token = None
-            
-            while True:
-                # Get playlist items
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.youtube.playlistItems().list(
-                        part='snippet',
-                        playlistId=playlist_id,
-                        maxResults=50,
-                        pageToken=next_page_token
-                    ).execute()
+        )
+    
+    async def get_playlist_info(self, playlist_id):
+        """Get the name of a YouTube playlist"""
+        if not self.api_enabled:
+            raise Exception("YouTube API key not configured. Please add YOUTUBE_API_KEY to your .env file.")
+        
+        playlist_response = await self.playlist_requests.do(
+            ('info', playlist_id),
+            lambda: self._api(
+                'playlists.list',
+                self.youtube.playlists().list(
+                    part='snippet',
+                    id=playlist_id,
+                    fields='items(snippet/title)'
                 )
-                
-                for item in response['items']:
-                    if (item['snippet']['title'] != 'Private video' and 
-                        item['snippet']['title'] != 'Deleted video'):
-                        
-                        videos.append({
-                            'title': item['snippet']['title'],
-                            'url': f"https://www.youtube.com/watch?v={item['snippet']['resourceId']['videoId']}",
-                            'thumbnail': item['snippet']['thumbnails'].get('default', {}).get('url'),
-                            'author': item['snippet'].get('videoOwnerChannelTitle', item['snippet']['channelTitle']),
-                            'description': item['snippet']['description']
-                        })
-                
+            )
+        )
+        
+        if not playlist_response.get('items'):
+            raise Exception("Playlist not found or is private")
+        
+        return {'name': playlist_response['items'][0]['snippet']['title']}
+    
+    async def iter_playlist_videos(self, playlist_id):
+        """Yield pages of videos from a YouTube playlist as they arrive"""
+        if not self.api_enabled:
+            raise Exception("YouTube API key not configured. Please add YOUTUBE_API_KEY to your .env file.")
+        
+        # Pages are chained by token, so request the next page while the caller handles this one
+        page = asyncio.ensure_future(self._fetch_playlist_page(playlist_id, None))
+        try:
+            while page:
+                response = await page
                 next_page_token = response.get('nextPageToken')
-                if not next_page_token:
-                    break
-            
-            logger.info(f"Found {len(videos)} videos in playlist: {playlist_info['snippet']['title']}")
-            
-            return {
-                'name': playlist_info['snippet']['title'],
-                'description': playlist_info['snippet']['description'],
-                'videos': videos
-            }
-            
+                page = asyncio.ensure_future(
+                    self._fetch_playlist_page(playlist_id, next_page_token)
+                ) if next_page_token else None
+                
+                yield self._parse_playlist_items(response)
+        finally:
+            if page:
+                page.cancel()
+    
+    async def open_playlist(self, playlist_id):
+        """Get a YouTube playlist whose videos arrive as an async iterator of pages"""
+        try:
+            logger.info(f"Fetching YouTube playlist: {playlist_id}")
+            playlist_info = await self.get_playlist_info(playlist_id)
         except Exception as error:
             logger.error(f"Failed to fetch YouTube playlist: {error}")
             raise Exception(f"Failed to fetch YouTube playlist: {error}")
+        
+        return {
+            'name': playlist_info['name'],
+            'videos': self.iter_playlist_videos(playlist_id)
+        }
     
-    async def get_video_info(self, url):
-        """Get video information from YouTube URL"""
+    async def extract_info(self, url, priority=INTERACTIVE):
+        """Run a yt-dlp extraction off the event loop, sharing one already running for the video"""
+        return await self.extractions.do(
+            extract_video_id(url) or url, lambda: self._extract_info(url, priority), priority
+        )
+    
+    async def _extract_info(self, url, priority):
+        backend = 'process' if extraction_pool.uses_processes else 'thread'
+        start = time.perf_counter()
         try:
             logger.info(f"Getting video info for: {url}")
             
-            loop = asyncio.get_event_loop()
-            
-            # Extract info using yt-dlp
-            info = await loop.run_in_executor(
-                None,
-                lambda: self.ytdl.extract_info(url, download=False)
-            )
+            # Extract info using yt-dlp in the extraction pool
+            if extraction_pool.uses_processes:
+                info = await extraction_pool.run(extract, url, priority=priority)
+            else:
+                info = summarize_info(await extraction_pool.run(
+                    self.ytdl.extract_info, url, download=False, priority=priority
+                ))
             
             if not info:
                 raise Exception("Could not get video details")
             
+            EXTRACT_SECONDS.labels(backend, 'ok').observe(time.perf_counter() - start)
             logger.info(f"Successfully got info for: {info.get('title', 'Unknown')}")
-            
-            return {
-                'title': info.get('title', 'Unknown'),
-                'duration': info.get('duration', 0),
-                'thumbnail': info.get('thumbnail'),
-                'url': url,
-                'author': info.get('uploader', 'Unknown')
-            }
+            return info
             
         except Exception as error:
+            EXTRACT_SECONDS.labels(backend, 'error').observe(time.perf_counter() - start)
             logger.error(f"Failed to get video info: {error}")
             raise Exception("Failed to get video information. This might be due to YouTube restrictions or the video being unavailable.")
     
+    def build_video_info(self, info, url):
+        """Build a queue track from a summarized yt-dlp info dict"""
+        return {
+            'title': info.get('title') or 'Unknown',
+            'duration': info.get('duration') or 0,
+            'thumbnail': info.get('thumbnail'),
+            'url': self.clean_url(url),
+            'author': info.get('uploader') or 'Unknown'
+        }
+    
+    async def get_cached_video_info(self, url):
+        """Get previously extracted video information without any network calls"""
+        return await metadata_cache.get('video_info', self.clean_url(url))
+    
+    async def cache_video_info(self, video_info):
+        """Remember extracted video information for later requests"""
+        await metadata_cache.set(
+            'video_info', video_info['url'], video_info, config.VIDEO_INFO_CACHE_TTL
+        )
+    
     def clean_url(self, url):
         """Clean and normalize YouTube URL"""
         try:
-            video_id = self.extract_video_id(url)
+            video_id = extract_video_id(url)
             return f"https://www.youtube.com/watch?v={video_id}" if video_id else url
         except:
             return url
\ No newline at end of file
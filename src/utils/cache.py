@@ -0,0 +1,210 @@
+"""
+Caching utilities for the Discord Music Bot
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from src.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a per-entry TTL"""
+
+    def __init__(self, max_entries=1000, default_ttl=3600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        """Get a value if it is present and has not expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return default
+
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entry when full"""
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl <= 0:
+            self.entries.pop(key, None)
+            return
+
+        self.entries[key] = (value, time.monotonic() + ttl)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove a value from the cache"""
+        entry = self.entries.pop(key, None)
+        return entry[0] if entry else default
+
+    def clear(self):
+        """Remove all values from the cache"""
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+class PersistentCache:
+    """Two-tier cache: an in-memory LRU in front of an on-disk SQLite store
+
+    Values are grouped by namespace, must be JSON-serializable, and survive
+    restarts. SQLite work runs on a single dedicated thread so lookups never
+    block the event loop.
+    """
+
+    # How many writes happen between size checks on the disk store
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path, memory_entries=2000, max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory = TTLCache(max_entries=memory_entries)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache')
+        self.connection = None
+        self.writes = 0
+        self.counters = {}
+
+    def _count(self, namespace, outcome):
+        counters = self.counters.setdefault(
+            namespace, {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        )
+        counters[outcome] += 1
+
+    def _connect(self):
+        """Open the SQLite store (runs on the cache thread)"""
+        if self.connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL, '
+                'PRIMARY KEY (namespace, key))'
+            )
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)'
+            )
+        return self.connection
+
+    def _disk_get(self, namespace, key):
+        connection = self._connect()
+        now = time.time()
+        row = connection.execute(
+            'SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?',
+            (namespace, key)
+        ).fetchone()
+
+        if row is None:
+            return None
+        if row[1] <= now:
+            connection.execute(
+                'DELETE FROM entries WHERE namespace = ? AND key = ?', (namespace, key)
+            )
+            connection.commit()
+            return None
+
+        connection.execute(
+            'UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?',
+            (now, namespace, key)
+        )
+        connection.commit()
+        return json.loads(row[0]), row[1] - now
+
+    def _disk_set(self, namespace, key, value, ttl):
+        connection = self._connect()
+        now = time.time()
+        connection.execute(
+            'INSERT OR REPLACE INTO entries (namespace, key, value, expires_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (namespace, key, json.dumps(value), now + ttl, now)
+        )
+
+        # Size-based eviction of the least recently used entries
+        self.writes += 1
+        if self.writes % self.EVICTION_INTERVAL == 0:
+            connection.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+            count = connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            if count > self.max_entries:
+                connection.execute(
+                    'DELETE FROM entries WHERE rowid IN '
+                    '(SELECT rowid FROM entries ORDER BY accessed_at LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+        connection.commit()
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    async def get(self, namespace, key):
+        """Get a cached value, checking memory first and then disk"""
+        value = self.memory.get((namespace, key))
+        if value is not None:
+            self._count(namespace, 'memory_hits')
+            return value
+
+        if self.path:
+            try:
+                row = await self._run(self._disk_get, namespace, key)
+            except Exception as error:
+                logger.warning(f"Cache read failed: {error}")
+                row = None
+
+            if row is not None:
+                value, ttl = row
+                self.memory.set((namespace, key), value, ttl)
+                self._count(namespace, 'disk_hits')
+                return value
+
+        self._count(namespace, 'misses')
+        return None
+
+    async def set(self, namespace, key, value, ttl):
+        """Store a value in both tiers"""
+        self.memory.set((namespace, key), value, ttl)
+
+        if self.path:
+            try:
+                await self._run(self._disk_set, namespace, key, value, ttl)
+            except Exception as error:
+                logger.warning(f"Cache write failed: {error}")
+
+    def stats(self):
+        """Get hit/miss counters per namespace"""
+        return {namespace: dict(counters) for namespace, counters in self.counters.items()}
+
+def normalize_query(query):
+    """Normalize a search query so trivial variations share a cache entry"""
+    return ' '.join(query.lower().split())
+
+# Global metadata cache instance (the database is opened on first use)
+metadata_cache = PersistentCache(
+    config.CACHE_PATH,
+    memory_entries=config.CACHE_MEMORY_ENTRIES,
+    max_entries=config.CACHE_MAX_ENTRIES
+)
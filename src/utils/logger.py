@@ -6,11 +6,12 @@ import logging
 import sys
 from datetime import datetime
 
-def setup_logger():
-    """Setup logging configuration"""
+def setup_logger(prefix=None):
+    """Setup logging configuration, optionally tagging every line with a prefix"""
     # Create formatter
+    tag = f"[{prefix}] " if prefix else ''
     formatter = logging.Formatter(
-        '[%(levelname)s] %(asctime)s - %(name)s - %(message)s',
+        f'[%(levelname)s] %(asctime)s - {tag}%(name)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
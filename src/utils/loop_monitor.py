@@ -0,0 +1,166 @@
+"""
+Event loop lag monitoring for the Discord Music Bot
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from src.config import config
+from src.utils.logger import get_logger
+from src.utils.metrics import Counter, Histogram
+
+logger = get_logger(__name__)
+
+LOOP_LAG_SECONDS = Histogram(
+    'musicbot_loop_lag_seconds', 'How late the event loop woke up from a timed sleep',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+SLOW_CALLBACKS = Counter(
+    'musicbot_slow_callbacks_total', 'Times the event loop was blocked past the threshold'
+)
+COMMAND_SECONDS = Histogram(
+    'musicbot_command_seconds', 'Wall time of each bot command', ['command']
+)
+
+# Lag samples kept for the stats summary, and how many offenders/commands to report
+RECENT_SAMPLES = 600
+TOP_OFFENDERS = 3
+
+# Frames inside the project are preferred when naming what blocked the loop
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def blocking_location(frame):
+    """Name the innermost project frame of a blocked stack, e.g. 'services/x.py:42 in f'"""
+    stack = traceback.extract_stack(frame)
+    for entry in reversed(stack):
+        if entry.filename.startswith(PROJECT_ROOT):
+            return f"{os.path.relpath(entry.filename, PROJECT_ROOT)}:{entry.lineno} in {entry.name}"
+    entry = stack[-1]
+    return f"{os.path.basename(entry.filename)}:{entry.lineno} in {entry.name}"
+
+class LoopMonitor:
+    """Measures event loop drift and captures the stack of whatever blocks the loop
+
+    A sampler task sleeps for a fixed interval and records how late it wakes
+    up. A watchdog thread notices when a wake-up is overdue by more than the
+    threshold and snapshots the loop thread's stack while it is still stuck,
+    so the offender is named even for blocking calls that never yield.
+    """
+
+    def __init__(self, interval=0.25, threshold=0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.enabled = False
+        self.loop = None
+        self.loop_thread_id = None
+        self.sampler = None
+        self.watchdog = None
+        self.stopping = threading.Event()
+        self.deadline = None
+        self.captured = None
+        self.samples = deque(maxlen=RECENT_SAMPLES)
+        self.max_lag = 0.0
+        self.offenders = {}
+        self.commands = {}
+
+    def start(self):
+        """Start sampling the running loop"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.stopping = threading.Event()
+        self.sampler = asyncio.ensure_future(self._sample())
+        self.watchdog = threading.Thread(
+            target=self._watch, args=(self.stopping,), name='loop-watchdog', daemon=True
+        )
+        self.watchdog.start()
+        logger.info(f"⏱️ Loop monitor enabled (slow callback threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        """Stop sampling; collected stats are kept"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.stopping.set()
+        if self.sampler:
+            self.sampler.cancel()
+        self.deadline = None
+        logger.info("⏱️ Loop monitor disabled")
+
+    async def _sample(self):
+        while True:
+            self.deadline = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self.deadline)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+
+            # The watchdog grabbed the stack while the loop was stuck; now we know how long
+            captured = self.captured
+            if captured and captured[0] == self.deadline:
+                self.captured = None
+                self._record_offender(captured[1], captured[2], lag)
+
+    def _watch(self, stopping):
+        while not stopping.wait(self.threshold / 2):
+            deadline = self.deadline
+            if deadline is None or time.monotonic() - deadline < self.threshold:
+                continue
+            if self.captured and self.captured[0] == deadline:
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            self.captured = (deadline, blocking_location(frame), ''.join(traceback.format_stack(frame)))
+
+    def _record_offender(self, location, stack, duration):
+        SLOW_CALLBACKS.inc()
+        offender = self.offenders.setdefault(location, {'count': 0, 'total': 0.0, 'max': 0.0})
+        offender['count'] += 1
+        offender['total'] += duration
+        offender['max'] = max(offender['max'], duration)
+        logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f}ms at {location}\n{stack.rstrip()}"
+        )
+
+    def record_command(self, name, duration):
+        """Record the wall time of a bot command"""
+        COMMAND_SECONDS.labels(name).observe(duration)
+        stats = self.commands.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['total'] += duration
+        stats['max'] = max(stats['max'], duration)
+
+    def stats(self):
+        """Recent lag percentiles, the worst blocking call sites and the slowest commands"""
+        ordered = sorted(self.samples)
+
+        def percentile(fraction):
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+        def worst(entries):
+            return sorted(entries.items(), key=lambda item: item[1]['max'], reverse=True)[:TOP_OFFENDERS]
+
+        return {
+            'enabled': self.enabled,
+            'lag_p50': percentile(0.5),
+            'lag_p99': percentile(0.99),
+            'lag_max': self.max_lag,
+            'slow_callbacks': sum(entry['count'] for entry in self.offenders.values()),
+            'offenders': worst(self.offenders),
+            'commands': worst(self.commands)
+        }
+
+# Global loop monitor instance (started from the bot's setup hook)
+loop_monitor = LoopMonitor(
+    interval=config.LOOP_MONITOR_INTERVAL,
+    threshold=config.SLOW_CALLBACK_THRESHOLD
+)
@@ -0,0 +1,257 @@
+"""
+Prometheus-style metrics for the Discord Music Bot
+
+Metrics are plain in-process counters, so recording one is a dict lookup and
+an addition. Gauges that summarize bot state are computed by callbacks only
+when /metrics is scraped.
+"""
+
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from aiohttp import web
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Latency buckets in seconds, from cache hits up to slow yt-dlp extractions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base class for a metric family with optional labels"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children = {}
+        self.function = None
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values, **kwargs):
+        """Get the child metric for a set of label values"""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self.children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        # Unlabelled metrics record straight into their single child
+        return self.labels()
+
+    def set_function(self, function):
+        """Compute the metric on scrape instead of recording it as things happen
+
+        The function returns a number, or for labelled metrics a dict mapping
+        label value tuples to numbers.
+        """
+        self.function = function
+
+    def samples(self):
+        """Yield (suffix, label values, extra label, value) tuples for rendering"""
+        if self.function is None:
+            for values, child in self.children.items():
+                yield '', values, None, child.value
+            return
+
+        try:
+            result = self.function()
+        except Exception as error:
+            logger.warning(f"Metric {self.name} callback failed: {error}")
+            return
+
+        if isinstance(result, dict):
+            for values, value in result.items():
+                yield '', tuple(str(label) for label in values), None, value
+        else:
+            yield '', (), None, result
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        for suffix, values, extra, value in self.samples():
+            labels = _format_labels(self.labelnames, values, extra)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return '\n'.join(lines)
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+class Counter(Metric):
+    """Monotonically increasing count (name it with a _total suffix)"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+class _GaugeChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+class Gauge(Metric):
+    """Value that can go up and down, or be computed at scrape time"""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def dec(self, amount=1):
+        self._default().dec(amount)
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        """Context manager that observes the wall time of its block"""
+        return self._default().time()
+
+    def samples(self):
+        for values, child in self.children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                yield '_bucket', values, ('le', _format_value(float(bound))), cumulative
+            yield '_bucket', values, ('le', '+Inf'), child.count
+            yield '_sum', values, None, child.sum
+            yield '_count', values, None, child.count
+
+class Registry:
+    """Collection of metric families rendered together"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        return '\n'.join(metric.render() for metric in self.metrics.values()) + '\n'
+
+# Global registry served on /metrics
+REGISTRY = Registry()
+
+class MetricsServer:
+    """Local aiohttp server exposing the registry on /metrics"""
+
+    def __init__(self, host, port, registry=None):
+        self.host = host
+        self.port = port
+        self.registry = registry or REGISTRY
+        self.runner = None
+
+    async def handle_metrics(self, request):
+        return web.Response(
+            text=self.registry.render(),
+            content_type='text/plain',
+            charset='utf-8',
+            headers={'X-Content-Type-Options': 'nosniff'}
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle_metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"📈 Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
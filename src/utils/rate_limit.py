@@ -0,0 +1,37 @@
+"""
+Rate limiting utilities for the Discord Music Bot
+"""
+
+import asyncio
+import time
+
+class TokenBucket:
+    """Async token bucket that refills at a fixed rate up to a burst capacity"""
+
+    def __init__(self, rate, capacity):
+        if rate <= 0:
+            raise ValueError("TokenBucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens=1):
+        """Wait until enough tokens are available and take them"""
+        # The lock keeps waiters in arrival order
+        async with self.lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+    def refund(self, tokens=1):
+        """Return tokens taken for work that turned out to be unnecessary"""
+        self.tokens = min(self.capacity, self.tokens + tokens)
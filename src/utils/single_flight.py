@@ -0,0 +1,78 @@
+"""
+Request coalescing for the Discord Music Bot
+"""
+
+import asyncio
+import weakref
+from src.utils.metrics import Counter, Gauge
+
+REQUESTS = Counter(
+    'musicbot_single_flight_requests_total',
+    'Coalescable requests by group and whether they started the work or joined it',
+    ['group', 'role']
+)
+IN_FLIGHT = Gauge('musicbot_single_flight_in_flight', 'Distinct requests currently in flight', ['group'])
+
+# Every live group, so stats can be reported across service instances
+GROUPS = weakref.WeakSet()
+
+class SingleFlight:
+    """Runs concurrent identical requests once and shares the result
+
+    The first caller for a key starts the work in a task; later callers for
+    the same key await that task instead of repeating it. The work is only
+    cancelled once every caller waiting on it has been cancelled. A caller
+    with a more urgent priority starts its own request rather than queueing
+    behind a background one, mirroring TrackMatcher.match.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.flights = {}
+        self.started = 0
+        self.joined = 0
+        GROUPS.add(self)
+
+    def _forget(self, key, task):
+        entry = self.flights.get(key)
+        if entry and entry[0] is task:
+            del self.flights[key]
+
+    async def do(self, key, factory, priority=0):
+        """Await factory() for key, joining a request already in flight for it"""
+        entry = self.flights.get(key)
+        if entry is None or priority < entry[2]:
+            task = asyncio.ensure_future(factory())
+            entry = self.flights[key] = [task, 0, priority]
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.started += 1
+            REQUESTS.labels(self.name, 'started').inc()
+        else:
+            self.joined += 1
+            REQUESTS.labels(self.name, 'joined').inc()
+
+        # Count waiters so the work is only cancelled when nobody needs it any more
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+def single_flight_stats():
+    """Started, joined and in-flight request counts for each group name"""
+    stats = {}
+    for group in list(GROUPS):
+        totals = stats.setdefault(group.name, {'started': 0, 'joined': 0, 'in_flight': 0})
+        totals['started'] += group.started
+        totals['joined'] += group.joined
+        totals['in_flight'] += len(group.flights)
+    return stats
+
+IN_FLIGHT.set_function(lambda: {
+    (name,): totals['in_flight'] for name, totals in single_flight_stats().items()
+})
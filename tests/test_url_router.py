@@ -0,0 +1,77 @@
+"""
+Tests for the play query URL router
+"""
+
+import pytest
+
+from src.utils.url_router import extract_video_id, route_url
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+PLAYLIST_ID = 'PLFgquLnL59alCl_2TQvOiD5Vgm1hCaGSI'
+SPOTIFY_ID = '37i9dQZF1DXcBWIGoYBM5M'
+
+# (query, kind, video ID, playlist ID, Spotify ID)
+CASES = [
+    (f"https://www.youtube.com/watch?v={VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://youtube.com/watch?v={VIDEO_ID}&t=42s", 'video', VIDEO_ID, None, None),
+    (f"https://m.youtube.com/watch?feature=share&v={VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://www.youtube.com/watch?v={VIDEO_ID}&list={PLAYLIST_ID}", 'video', VIDEO_ID, PLAYLIST_ID, None),
+    (f"https://music.youtube.com/watch?v={VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://youtu.be/{VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://youtu.be/{VIDEO_ID}?si=abc123", 'video', VIDEO_ID, None, None),
+    (f"youtu.be/{VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"www.youtube.com/watch?v={VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://www.youtube.com/embed/{VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://www.youtube.com/v/{VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://www.youtube.com/shorts/{VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    (f"https://www.youtube.com/live/{VIDEO_ID}?feature=share", 'video', VIDEO_ID, None, None),
+    (f"  https://www.youtube.com/watch?v={VIDEO_ID}  ", 'video', VIDEO_ID, None, None),
+    (f"HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}", 'video', VIDEO_ID, None, None),
+    ("https://www.youtube.com/watch?v=tooshort", 'url', None, None, None),
+    ("https://www.youtube.com/@somechannel", 'url', None, None, None),
+    (f"https://www.youtube.com/playlist?list={PLAYLIST_ID}", 'playlist', None, PLAYLIST_ID, None),
+    (f"https://music.youtube.com/playlist?list={PLAYLIST_ID}", 'playlist', None, PLAYLIST_ID, None),
+    ("https://www.youtube.com/playlist", 'playlist', None, None, None),
+    (f"https://open.spotify.com/playlist/{SPOTIFY_ID}", 'spotify_playlist', None, None, SPOTIFY_ID),
+    (f"https://open.spotify.com/playlist/{SPOTIFY_ID}?si=0123abcd", 'spotify_playlist', None, None, SPOTIFY_ID),
+    (f"https://open.spotify.com/intl-de/playlist/{SPOTIFY_ID}", 'spotify_playlist', None, None, SPOTIFY_ID),
+    (f"https://open.spotify.com/embed/playlist/{SPOTIFY_ID}", 'spotify_playlist', None, None, SPOTIFY_ID),
+    (f"open.spotify.com/playlist/{SPOTIFY_ID}", 'spotify_playlist', None, None, SPOTIFY_ID),
+    (f"spotify:playlist:{SPOTIFY_ID}", 'spotify_playlist', None, None, SPOTIFY_ID),
+    ("https://open.spotify.com/playlist/not-an-id", 'spotify_playlist', None, None, None),
+    (f"https://open.spotify.com/album/{SPOTIFY_ID}", 'spotify_album', None, None, SPOTIFY_ID),
+    (f"https://open.spotify.com/track/{SPOTIFY_ID}?si=x", 'spotify_track', None, None, SPOTIFY_ID),
+    (f"spotify:track:{SPOTIFY_ID}", 'spotify_track', None, None, SPOTIFY_ID),
+    (f"https://open.spotify.com/artist/{SPOTIFY_ID}", 'spotify_artist', None, None, SPOTIFY_ID),
+    (f"spotify:artist:{SPOTIFY_ID}", 'spotify_artist', None, None, SPOTIFY_ID),
+    ("https://open.spotify.com/show/abc", 'url', None, None, None),
+    ("https://soundcloud.com/artist/song", 'url', None, None, None),
+    (f"https://notyoutube.com/watch?v={VIDEO_ID}", 'url', None, None, None),
+    ("https://[broken", 'url', None, None, None),
+    ("never gonna give you up", 'search', None, None, None),
+    ("youtube.com watch", 'search', None, None, None),
+    ("despacito", 'search', None, None, None),
+    ("ftp://example.com/song.mp3", 'search', None, None, None),
+]
+
+@pytest.mark.parametrize('query, kind, video_id, playlist_id, spotify_id', CASES)
+def test_route_url(query, kind, video_id, playlist_id, spotify_id):
+    route = route_url(query)
+    assert (route.kind, route.video_id, route.playlist_id, route.spotify_id) == (
+        kind, video_id, playlist_id, spotify_id
+    )
+
+@pytest.mark.parametrize('query, source', [
+    (f"https://www.youtube.com/watch?v={VIDEO_ID}", 'youtube'),
+    (f"https://music.youtube.com/watch?v={VIDEO_ID}", 'youtube_music'),
+    (f"https://youtu.be/{VIDEO_ID}", 'youtu.be'),
+    (f"https://open.spotify.com/track/{SPOTIFY_ID}", 'spotify'),
+    ("never gonna give you up", None),
+])
+def test_route_source(query, source):
+    assert route_url(query).source == source
+
+def test_extract_video_id():
+    assert extract_video_id(f"https://youtu.be/{VIDEO_ID}") == VIDEO_ID
+    assert extract_video_id("https://soundcloud.com/artist/song") is None